@@ -1,20 +1,53 @@
 """
 analyzer.py - Розумний аналізатор з контекстним розумінням гри - ВИПРАВЛЕНО
 """
+import os
 import time
 import re
 import logging
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
+# Tesseract з OpenMP на кількох потоках працює повільніше ніж на одному і
+# конкурує з захопленням екрану. Для паралельного аналізу - кілька процесів
+# з однопотоковим Tesseract, а не більше потоків OpenMP.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
 import cv2
 import numpy as np
 import pytesseract
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
+
+try:
+    import tesserocr  # Постійний Tesseract API без запуску процесу на кожен кадр
+except ImportError:
+    tesserocr = None
+
+try:
+    import mss  # Швидке захоплення екрану (BitBlt / XShmGetImage)
+except ImportError:
+    mss = None
+
+try:
+    import ahocorasick  # Пошук усіх ключових слів за один прохід по тексту
+except ImportError:
+    ahocorasick = None
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:
+    fuzz = fuzz_process = None
 
-from config import ParasiteConfig, TaskConfig, SCREENSHOTS_DIR
+from config import (
+    ParasiteConfig, TaskConfig, PerformanceConfig, compile_matcher,
+    SCREENSHOTS_DIR, TESSDATA_PATH
+)
 
 
 # ======================== КОНТЕКСТ ГРИ ========================
@@ -36,9 +69,9 @@ class GameContext:
     water_level: str = "unknown"  # full, medium, low, empty
     has_fertilizer: bool = True
     
-    # Історія подій
-    recent_parasites: List[str] = field(default_factory=list)
-    recent_actions: List[str] = field(default_factory=list)
+    # Історія подій (старі записи відкидаються автоматично)
+    recent_parasites: Deque[str] = field(default_factory=lambda: deque(maxlen=10))
+    recent_actions: Deque[str] = field(default_factory=lambda: deque(maxlen=20))
     
     def add_action(self, action: str):
         """Додавання дії до історії."""
@@ -46,16 +79,10 @@ class GameContext:
         self.last_action_time = time.time()
         self.total_actions += 1
         self.recent_actions.append(f"{datetime.now().strftime('%H:%M:%S')} - {action}")
-        
-        # Обмеження історії до 20 подій
-        if len(self.recent_actions) > 20:
-            self.recent_actions.pop(0)
     
     def add_parasite(self, parasite_name: str):
         """Додавання паразита до історії."""
         self.recent_parasites.append(parasite_name)
-        if len(self.recent_parasites) > 10:
-            self.recent_parasites.pop(0)
     
     def get_status_summary(self) -> str:
         """Отримання стислого статусу."""
@@ -81,6 +108,7 @@ class ScreenAnalysis:
     water_amount_needed: Optional[float] = None
     needs_fertilizer: bool = False
     soil_level: Optional[int] = None
+    keywords_found: List[str] = field(default_factory=list)  # DIAGNOSTIC_KEYWORDS у тексті
     
     # Додаткова інформація
     ui_elements_detected: List[str] = field(default_factory=list)
@@ -90,8 +118,14 @@ class ScreenAnalysis:
     # Метрики
     confidence: float = 0.0
     screenshot_path: Optional[Path] = None
+    screenshot_size: Optional[int] = None  # Байт; заповнюється після запису у фоні
     analysis_time: float = 0.0
     
+    @cached_property
+    def text_lower(self) -> str:
+        """Текст у нижньому регістрі (один раз на аналіз, для всіх споживачів)."""
+        return self.text.lower()
+    
     def get_summary(self) -> str:
         """Стислий опис аналізу."""
         parts = []
@@ -121,10 +155,70 @@ class ScreenAnalysis:
 class SmartAnalyzer:
     """Розумний аналізатор з контекстним розумінням - ВИПРАВЛЕНО."""
     
-    def __init__(self, config: TaskConfig, window_manager=None, performance_optimizer=None):
+    # Тип екрану (порядок = пріоритет)
+    SCREEN_KEYWORDS = {
+        'gameplay': ['полив', 'грунт', 'рослин', 'цибул', 'добрив'],
+        'inventory': ['інвентар', 'inventory', 'предмет', 'хімікат'],
+        'shop': ['магазин', 'shop', 'купити', 'продати'],
+        'menu': ['меню', 'menu', 'налаштування', 'settings'],
+    }
+    
+    UI_KEYWORDS = {
+        'button_watering': ['полити', 'water', 'лейка'],
+        'button_chemical': ['хімікат', 'chemical', 'обробити'],
+        'status_bar': ['здоров', 'health', 'енергія', 'energy'],
+        'inventory': ['інвентар', 'inventory'],
+    }
+    
+    LOW_WATER_KEYWORDS = [
+        'мало води', 'низьк', 'недостатн', 'потрібн', 
+        'треба полив', 'додати вод', 'долити',
+        'water low', 'need water'
+    ]
+    
+    FERTILIZER_KEYWORDS = [
+        'добрив', 'азотн', 'fertilizer', 'nitrogen',
+        'підживлення', 'удобрение'
+    ]
+    
+    # Кількість води та рівень грунту - одна регулярка, один прохід по тексту.
+    # Альтернативи загорнуті в lookahead, щоб не "з'їдати" текст одна одної:
+    # перший збіг кожної групи = перший збіг відповідного окремого шаблону.
+    SCREEN_VALUES_RE = re.compile(
+        r'(?=(?P<litres>\d+[\.,]?\d*)\s*л(?P<litres_word>ітр)?'
+        r'|води.*?(?P<water>\d+[\.,]?\d*)'
+        r'|налити.*?(?P<pour>\d+[\.,]?\d*)'
+        r'|грунт.*?(?P<soil>\d+)\s*%'
+        r'|soil.*?(?P<soil_en>\d+)\s*%'
+        r'|земл.*?(?P<earth>\d+)\s*%)'
+    )
+    WATER_AMOUNT_GROUPS = ('litres', 'litres_word', 'water', 'pour')  # Порядок = пріоритет
+    SOIL_LEVEL_GROUPS = ('soil', 'soil_en', 'earth')
+    
+    # Конфігурації pytesseract (мови, параметри) - порядок = пріоритет
+    PYTESSERACT_FLAGS = '--oem 1 ' + ' '.join(
+        f'-c {name}={value}' for name, value in PerformanceConfig.OCR_TESS_VARIABLES.items()
+    )
+    PYTESSERACT_CONFIGS = (
+        ('ukr+rus+eng', f'--psm 6 {PYTESSERACT_FLAGS}'),  # Найкраща якість
+        ('ukr+rus+eng', f'--psm 11 {PYTESSERACT_FLAGS}'),  # Sparse text
+        ('rus+eng', f'--psm 6 {PYTESSERACT_FLAGS}'),
+        ('ukr', f'--psm 6 {PYTESSERACT_FLAGS}'),
+    )
+    
+    # Ключові слова для діагностики в логах
+    DIAGNOSTIC_KEYWORDS = [
+        'полив', 'вода', 'рослин', 'грунт', 'добрив', 'літр', 'паразит',
+        'тля', 'слизн', 'жук', 'медвед', 'трипс', 'клещ', 'нематод', 'проволочник',
+        'кравчик', 'щелкун', 'колорадск'
+    ]
+    
+    def __init__(self, config: TaskConfig, window_manager=None, performance_optimizer=None,
+                 ocr_pool: Optional[ThreadPoolExecutor] = None, tess_api=None):
         self.config = config
         self.window_manager = window_manager
         self.performance_optimizer = performance_optimizer
+        self.ocr_pool = ocr_pool  # Спільний пул для паралельних спроб OCR (володіє бот)
         
         # Контекст гри
         self.game_context = GameContext()
@@ -134,13 +228,45 @@ class SmartAnalyzer:
         self.last_screenshot_time = 0
         self.screenshot_interval = 5.0
         
+        # Захоплення екрану через mss: екземпляр на потік (mss на Windows тримає
+        # контексти GDI у threading.local - працює лише в потоці, що його створив)
+        self._mss_local = threading.local()
+        
         # Кеш для OCR
         self.last_ocr_result = ""
         self.last_ocr_time = 0
         self.ocr_cache_duration = 2.0
         
-        # Cooldown для дій
-        self.action_cooldowns: Dict[str, float] = {}
+        # Останній проаналізований кадр (незмінний екран не аналізуємо повторно)
+        self._last_thumb: Optional[np.ndarray] = None
+        self._last_analysis: Optional[ScreenAnalysis] = None
+        self._reuse_streak = 0  # Скільки кадрів поспіль віддано попередній аналіз
+        
+        # Буфери для проміжних зображень OCR (без виділення пам'яті на кожен кадр)
+        self._scratch_buffers: Dict[str, np.ndarray] = {}
+        
+        # Варіанти назв паразитів: таблиця з конфігурації (або власна для TaskConfig без парсера)
+        if config.parasite_scanner is not None:
+            parasite_variants = config.parasite_scanner.variants
+        else:
+            parasite_variants = compile_matcher(config.parasites)
+        
+        # Індекс ключових слів разом з назвами паразитів: один прохід по тексту на кадр
+        self._keyword_refs = self._build_keyword_refs(parasite_variants)
+        self._kw_automaton = self._build_keyword_automaton(self._keyword_refs)
+        
+        # Постійний Tesseract API (володіє бот; None - OCR через pytesseract)
+        self.tess_api = tess_api
+        self._last_ocr_config: Optional[Tuple[str, str]] = None  # Для pytesseract
+        
+        # Фонові потоки: запис скріншотів і асинхронний аналіз
+        # (кодування зображень та Tesseract відпускають GIL)
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analyzer-io')
+        self._save_future: Optional[Future] = None  # Не більше одного скріншоту в черзі на запис
+        self._analysis_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analyzer')
+        
+        # Cooldown для дій: момент (time.monotonic_ns), з якого дія знову дозволена
+        self._next_allowed_ns: Dict[str, int] = {}
         self.default_cooldown = 3.0
         
         # Статистика
@@ -149,11 +275,99 @@ class SmartAnalyzer:
             'scans_successful': 0,
             'parasites_detected': 0,
             'water_warnings': 0,
+            'scans_timed': 0,
+            'frames_unchanged': 0,
             'avg_analysis_time': 0.0
         }
+        self._analysis_times: Deque[float] = deque(maxlen=1000)  # Вікно для p99
         
         logging.info("🔍 Ініціалізовано Smart Analyzer (FIXED VERSION)")
     
+    @classmethod
+    def _build_keyword_refs(cls, parasite_variants: Dict[str, Tuple[str, ...]]) -> Dict[str, List[Tuple[str, str]]]:
+        """Ключове слово -> список (категорія, мітка); варіанти паразитів - з міткою-ключем паразита."""
+        refs = defaultdict(list)
+        
+        for variant, keys in parasite_variants.items():
+            for key in keys:
+                refs[variant].append(('parasite', key))
+        
+        for screen, keywords in cls.SCREEN_KEYWORDS.items():
+            for kw in keywords:
+                refs[kw].append(('screen', screen))
+        
+        for element_type, keywords in cls.UI_KEYWORDS.items():
+            for kw in keywords:
+                refs[kw].append(('ui', element_type))
+        
+        for kw in cls.LOW_WATER_KEYWORDS:
+            refs[kw].append(('water_low', kw))
+        
+        for kw in cls.FERTILIZER_KEYWORDS:
+            refs[kw].append(('fertilizer', kw))
+        
+        for kw in cls.DIAGNOSTIC_KEYWORDS:
+            refs[kw].append(('diagnostic', kw))
+        
+        return dict(refs)
+    
+    @staticmethod
+    def _build_keyword_automaton(keyword_refs: Dict[str, List[Tuple[str, str]]]):
+        """Aho-Corasick автомат по всіх ключових словах (або None)."""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for kw, refs in keyword_refs.items():
+            automaton.add_word(kw, tuple(refs))
+        automaton.make_automaton()
+        return automaton
+    
+    def _scan_keywords(self, text: str) -> Dict[str, Set[str]]:
+        """Класифікація тексту по всіх категоріях ключових слів за один прохід."""
+        hits = defaultdict(set)
+        
+        if self._kw_automaton is not None:
+            for _, refs in self._kw_automaton.iter(text):
+                for category, label in refs:
+                    hits[category].add(label)
+        else:
+            for kw, refs in self._keyword_refs.items():
+                if kw in text:
+                    for category, label in refs:
+                        hits[category].add(label)
+        
+        return hits
+    
+    @staticmethod
+    def create_tess_api():
+        """Створення постійного tesserocr API (або None - тоді pytesseract)."""
+        if tesserocr is None:
+            logging.info("💡 tesserocr не встановлено - OCR через pytesseract")
+            return None
+        
+        try:
+            api = tesserocr.PyTessBaseAPI(
+                path=TESSDATA_PATH,
+                lang=PerformanceConfig.OCR_LANGS,
+                oem=tesserocr.OEM.LSTM_ONLY,
+                variables=PerformanceConfig.OCR_TESS_VARIABLES
+            )
+            logging.info(f"✅ Постійний Tesseract API: {PerformanceConfig.OCR_LANGS}")
+            return api
+        except Exception as e:
+            logging.warning(f"⚠️ Не вдалося створити tesserocr API, використовується pytesseract: {e}")
+            return None
+    
+    def run_after_analysis(self, fn) -> Future:
+        """Виконати fn у потоці аналізу - після кадру, який зараз обробляється."""
+        return self._analysis_pool.submit(fn)
+    
+    def close(self):
+        """Звільнення ресурсів: фонові потоки (Tesseract API закриває бот)."""
+        self._analysis_pool.shutdown(wait=True)
+        self._io_pool.shutdown(wait=True)  # Дочекатися запису скріншотів
+    
     def set_analysis_region(self, x1: int, y1: int, x2: int, y2: int):
         """Встановлення області аналізу."""
         self.analysis_region = (x1, y1, x2, y2)
@@ -174,41 +388,83 @@ class SmartAnalyzer:
             self.set_analysis_region(x1, y1, x2, y2)
             logging.info(f"🖥️ Автоматично встановлено нижню 50% екрану")
     
-    def capture_screen(self) -> Optional[np.ndarray]:
-        """Захоплення екрану через Window Manager або PIL."""
+    def capture_screen(self, buffer: Optional[memoryview] = None) -> Optional[np.ndarray]:
+        """Захоплення екрану через Window Manager, mss або PIL.
+        
+        buffer - перевикористовуваний буфер кадру; якщо кадр вміщається,
+        конвертація в BGR пишеться прямо в нього, інакше повертається view з кроками.
+        """
         try:
             if self.window_manager:
                 # Використовуємо window manager
                 region = self.analysis_region or self.window_manager.get_ui_region('bottom')
                 screenshot = self.window_manager.capture_window(region)
                 if screenshot:
-                    screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-                    return screenshot
+                    return self._to_bgr(np.asarray(screenshot), cv2.COLOR_RGB2BGR, buffer)
             
-            # Fallback - PIL
+            # Fallback - mss / PIL
             if self.analysis_region:
-                screenshot = ImageGrab.grab(bbox=self.analysis_region)
+                bbox = self.analysis_region
             else:
                 # Автоматично нижня половина
                 import pyautogui
                 screen_width, screen_height = pyautogui.size()
-                screenshot = ImageGrab.grab(bbox=(0, screen_height // 2, screen_width, screen_height))
+                bbox = (0, screen_height // 2, screen_width, screen_height)
             
-            return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            if mss is not None:
+                try:
+                    return self._to_bgr(self._grab_mss(bbox), cv2.COLOR_BGRA2BGR, buffer)
+                except Exception as e:
+                    # Наступне захоплення в цьому потоці створить mss заново
+                    self._mss_local.sct = None
+                    logging.debug(f"mss не спрацював, захоплення через PIL: {e}")
+            
+            screenshot = ImageGrab.grab(bbox=bbox)
+            return self._to_bgr(np.asarray(screenshot), cv2.COLOR_RGB2BGR, buffer)
             
         except Exception as e:
             logging.error(f"❌ Помилка захоплення екрану: {e}")
             return None
     
-    def analyze_screen(self, save_screenshot: bool = True) -> ScreenAnalysis:
-        """Головний метод аналізу екрану - ВИПРАВЛЕНО з детальним логуванням."""
-        start_time = time.time()
+    @staticmethod
+    def _to_bgr(raw: np.ndarray, code: int, buffer: Optional[memoryview]) -> np.ndarray:
+        """Кадр захоплення (BGRA від mss або RGB від PIL) у BGR.
+        
+        З буфером - один прохід cvtColor прямо в нього: суцільний кадр, який
+        OpenCV далі не копіює. Без буфера - view з кроками, без жодної копії.
+        """
+        h, w = raw.shape[:2]
+        if buffer is None or h * w * 3 > buffer.nbytes:
+            # BGRA: відкидаємо альфа-канал зрізом; RGB: зворотний порядок каналів
+            return raw[:, :, :3] if code == cv2.COLOR_BGRA2BGR else raw[..., 2::-1]
+        
+        out = np.frombuffer(buffer, dtype=np.uint8, count=h * w * 3).reshape(h, w, 3)
+        return cv2.cvtColor(raw, code, dst=out)
+    
+    def _grab_mss(self, bbox: Tuple[int, int, int, int]) -> np.ndarray:
+        """Захоплення області через mss (сирий BGRA, без копії)."""
+        sct = getattr(self._mss_local, 'sct', None)
+        if sct is None:
+            sct = self._mss_local.sct = mss.mss()
+        
+        x1, y1, x2, y2 = bbox
+        raw = sct.grab({'left': x1, 'top': y1, 'width': x2 - x1, 'height': y2 - y1})
+        return np.asarray(raw)
+    
+    def analyze_screen(self, save_screenshot: bool = True, buffer: Optional[memoryview] = None,
+                       gpu: bool = False, frame: Optional[np.ndarray] = None) -> ScreenAnalysis:
+        """Головний метод аналізу екрану - ВИПРАВЛЕНО з детальним логуванням.
+        
+        frame - кадр, захоплений заздалегідь (конвеєр: наступний кадр
+        захоплюється, поки йде OCR поточного); інакше кадр захоплюється тут.
+        """
+        start_time = time.perf_counter()
         self.stats['scans_total'] += 1
         
         analysis = ScreenAnalysis(text="", text_confidence=0.0)
         
         # Захоплення
-        screenshot = self.capture_screen()
+        screenshot = frame if frame is not None else self.capture_screen(buffer)
         if screenshot is None:
             logging.error("❌ Не вдалося захопити екран")
             return analysis
@@ -217,38 +473,67 @@ class SmartAnalyzer:
         if self.performance_optimizer:
             screenshot = self.performance_optimizer.optimize_screenshot(screenshot)
         
+        # Екран не змінився - повертаємо попередній результат без OCR
+        thumb = self._frame_thumb(screenshot)
+        if self._frame_unchanged(thumb):
+            self.stats['frames_unchanged'] += 1
+            logging.debug("⏭️ Кадр не змінився, використано попередній аналіз")
+            # Списки копіюються: споживачі можуть змінювати результат, а попередній
+            # аналіз ще віддаватиметься наступним незмінним кадрам
+            last = self._last_analysis
+            return replace(last, text_lines=list(last.text_lines),
+                           parasites_found=list(last.parasites_found),
+                           keywords_found=list(last.keywords_found),
+                           ui_elements_detected=list(last.ui_elements_detected),
+                           screenshot_path=None, screenshot_size=None,
+                           analysis_time=time.perf_counter() - start_time)
+        
+        frame_hash = None
+        if self.performance_optimizer:
+            frame_hash = self.performance_optimizer.compute_image_hash(screenshot)
+        
         # Збереження скріншоту (економія ресурсів)
         current_time = time.time()
         should_save = save_screenshot and (current_time - self.last_screenshot_time >= self.screenshot_interval)
         
+        # Попередній запис ще триває (повільний диск) - кадри в пам'яті не накопичуємо
+        if should_save and self._save_future is not None and not self._save_future.done():
+            logging.debug("⏭️ Попередній скріншот ще записується, пропуск збереження")
+            should_save = False
+        
         if should_save:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = SCREENSHOTS_DIR / f"screen_{timestamp}.jpg"
             
-            if self.performance_optimizer:
-                self.performance_optimizer.save_screenshot_optimized(screenshot, screenshot_path)
-            else:
-                cv2.imwrite(str(screenshot_path), screenshot)
+            # Запис на диск у фоні, OCR не чекає на нього. Буфер кадру
+            # перезапише наступний скан - у фон віддаємо копію
+            if buffer is not None and np.shares_memory(screenshot, np.frombuffer(buffer, dtype=np.uint8)):
+                screenshot = screenshot.copy()
+            
+            self._save_future = self._io_pool.submit(self._write_screenshot, analysis, screenshot, screenshot_path)
             
             analysis.screenshot_path = screenshot_path
             self.last_screenshot_time = current_time
-            logging.debug(f"💾 Збережено: {screenshot_path.name}")
+            logging.debug(f"💾 Збереження у фоні: {screenshot_path.name}")
         
         # OCR аналіз
-        text, confidence, lines = self._extract_text_enhanced(screenshot)
+        text, confidence, lines = self._extract_text_enhanced(screenshot, frame_hash, gpu)
         analysis.text = text
         analysis.text_confidence = confidence
         analysis.text_lines = lines
         
         if not text:
             logging.debug("⏭️ Текст не розпізнано на кадрі")
-            analysis.analysis_time = time.time() - start_time
+            analysis.analysis_time = time.perf_counter() - start_time
+            self._remember_analysis(thumb, analysis)
             return analysis
         
-        text_lower = text.lower()
+        text_lower = analysis.text_lower
+        text_words = text_lower.split()
+        keyword_hits = self._scan_keywords(text_lower)
         
         # Визначення поточного екрану
-        analysis.current_screen = self._detect_screen_type(text_lower, lines)
+        analysis.current_screen = self._detect_screen_type(keyword_hits)
         self.game_context.current_location = analysis.current_screen
         
         logging.info(f"📱 Екран: {analysis.current_screen} | Впевненість OCR: {confidence:.1%}")
@@ -266,10 +551,8 @@ class SmartAnalyzer:
             logging.info(f"   📋 Приклад тексту: '{preview}...'")
             
             # Пошук ключових слів
-            keywords = ['полив', 'вода', 'рослин', 'грунт', 'добрив', 'літр', 'паразит',
-                       'тля', 'слизн', 'жук', 'медвед', 'трипс', 'клещ', 'нематод', 'проволочник',
-                       'кравчик', 'щелкун', 'колорадск']
-            found_keywords = [kw for kw in keywords if kw in text.lower()]
+            found_keywords = [kw for kw in self.DIAGNOSTIC_KEYWORDS if kw in keyword_hits['diagnostic']]
+            analysis.keywords_found = found_keywords
             if found_keywords:
                 logging.info(f"   🔑 Знайдено ключові слова: {', '.join(found_keywords)}")
             else:
@@ -277,7 +560,7 @@ class SmartAnalyzer:
                 logging.warning(f"   💡 Можливо потрібно покращити область аналізу або якість OCR")
         
         # Пошук паразитів (покращена логіка)
-        parasites = self._detect_parasites(text_lower, lines)
+        parasites = self._detect_parasites(text_words, keyword_hits['parasite'])
         analysis.parasites_found = parasites
         
         parasites_info = ", ".join([p.name for p in parasites]) if parasites else "немає"
@@ -291,8 +574,11 @@ class SmartAnalyzer:
             parasites_str = ", ".join([p.name for p in parasites])
             logging.info(f"🐛 ВИЯВЛЕНО ПАРАЗИТІВ: {parasites_str}")
         
+        # Кількість води та рівень грунту (один прохід регулярки)
+        water_amount, soil = self._parse_screen_values(text_lower)
+        
         # Перевірка рівня води (контекстний аналіз)
-        water_info = self._analyze_water_status(text_lower, lines)
+        water_info = self._analyze_water_status(keyword_hits, water_amount)
         analysis.water_level_low = water_info['low']
         analysis.water_amount_needed = water_info.get('amount')
         
@@ -307,18 +593,17 @@ class SmartAnalyzer:
             logging.warning(f"💧 НИЗЬКИЙ РІВЕНЬ ВОДИ: {water_info}")
         
         # Перевірка добрива
-        analysis.needs_fertilizer = self._check_fertilizer_need(text_lower, lines)
+        analysis.needs_fertilizer = self._check_fertilizer_need(keyword_hits)
         if analysis.needs_fertilizer:
             logging.info(f"   🌱 Потрібне добриво: ТАК")
         
         # Рівень грунту
-        soil = self._parse_soil_level(text_lower)
         if soil:
             analysis.soil_level = soil
             logging.info(f"   🌍 Рівень грунту: {soil}%")
         
         # UI елементи
-        ui_elements = self._detect_ui_elements(text_lower, lines)
+        ui_elements = self._detect_ui_elements(keyword_hits)
         analysis.ui_elements_detected = ui_elements
         logging.info(f"   🎮 UI елементи: {len(ui_elements)} - {', '.join(ui_elements) if ui_elements else 'немає'}")
         
@@ -330,8 +615,11 @@ class SmartAnalyzer:
         logging.info("=" * 80)
         # ========== КІНЕЦЬ ДІАГНОСТИКИ ==========
         
-        analysis.analysis_time = time.time() - start_time
-        self.stats['avg_analysis_time'] = (self.stats['avg_analysis_time'] + analysis.analysis_time) / 2
+        analysis.analysis_time = time.perf_counter() - start_time
+        # Справжнє ковзне середнє (а не (a + b) / 2, що забуває старі заміри)
+        self.stats['scans_timed'] += 1
+        self.stats['avg_analysis_time'] += (analysis.analysis_time - self.stats['avg_analysis_time']) / self.stats['scans_timed']
+        self._analysis_times.append(analysis.analysis_time)
         
         if analysis.confidence > 0.15:  # Знижений поріг
             self.stats['scans_successful'] += 1
@@ -343,143 +631,301 @@ class SmartAnalyzer:
         else:
             logging.debug(f"⏭️ Аналіз: нічого важливого | Час: {analysis.analysis_time:.2f}с")
         
+        self._remember_analysis(thumb, analysis)
         return analysis
     
-    def _extract_text_enhanced(self, image: np.ndarray) -> Tuple[str, float, List[str]]:
+    def _write_screenshot(self, analysis: ScreenAnalysis, image: np.ndarray, path: Path):
+        """Запис скріншоту (у фоновому потоці) і розмір файлу в analysis."""
+        if self.performance_optimizer:
+            saved = self.performance_optimizer.save_screenshot_optimized(image, path)
+        else:
+            saved = cv2.imwrite(str(path), image,
+                                [cv2.IMWRITE_JPEG_QUALITY, PerformanceConfig.SCREENSHOT_QUALITY,
+                                 cv2.IMWRITE_JPEG_OPTIMIZE, 0])
+        if saved:
+            analysis.screenshot_size = path.stat().st_size
+    
+    def flush_screenshots(self):
+        """Дочекатися запису останнього скріншоту."""
+        if self._save_future is not None:
+            self._save_future.result()
+    
+    def analyze_screen_async(self, save_screenshot: bool = True, buffer: Optional[memoryview] = None,
+                             gpu: bool = False) -> Future:
+        """Аналіз у фоновому потоці - викликач може готувати наступний кадр, поки йде OCR."""
+        return self._analysis_pool.submit(self.analyze_screen, save_screenshot, buffer, gpu)
+    
+    @staticmethod
+    def _frame_thumb(image: np.ndarray) -> np.ndarray:
+        """Мініатюра 256x144 (зелений канал) області аналізу для порівняння кадрів.
+        
+        Піксель мініатюри усереднює лише кілька десятків пікселів кадру, тож
+        зміна однієї цифри ("85%" -> "86%") помітно зсуває його значення.
+        """
+        return cv2.resize(image, (256, 144), interpolation=cv2.INTER_AREA)[:, :, 1]
+    
+    def _frame_unchanged(self, thumb: np.ndarray) -> bool:
+        """Кадр практично збігається з останнім проаналізованим.
+        
+        Порівнюється максимальна різниця пікселя, а не сума: зміна кількох
+        символів тексту на мініатюрі - це кілька пікселів, які сума б розмила.
+        Після FRAME_REUSE_MAX повторів поспіль кадр аналізується повністю.
+        """
+        if self._last_analysis is None or self._last_thumb is None:
+            return False
+        if self._reuse_streak >= PerformanceConfig.FRAME_REUSE_MAX:
+            return False
+        if cv2.norm(thumb, self._last_thumb, cv2.NORM_INF) > PerformanceConfig.FRAME_DIFF_THRESHOLD:
+            return False
+        
+        self._reuse_streak += 1
+        return True
+    
+    def _remember_analysis(self, thumb: np.ndarray, analysis: ScreenAnalysis):
+        """Запам'ятати результат для наступного незмінного кадру."""
+        self._last_thumb = thumb
+        self._last_analysis = analysis
+        self._reuse_streak = 0
+    
+    def _extract_text_enhanced(self, image: np.ndarray, image_hash: Optional[int] = None,
+                               gpu: bool = False) -> Tuple[str, float, List[str]]:
         """Покращене розпізнавання тексту з багатьма спробами."""
         try:
             # Перевірка кешу
             if self.performance_optimizer:
-                cached = self.performance_optimizer.get_cached_ocr(image)
+                if image_hash is None:
+                    image_hash = self.performance_optimizer.compute_image_hash(image)
+                cached = self.performance_optimizer.get_cached_ocr(image_hash)
                 if cached:
                     lines = cached.split('\n')
                     return cached, 0.85, lines
             
-            # Попередня обробка
-            if self.performance_optimizer:
-                processed = self.performance_optimizer.preprocess_for_ocr(image, mode='aggressive')
+            if gpu and self.performance_optimizer and self.performance_optimizer.ocr_on_gpu:
+                # Сіре + зменшення на GPU, назад на CPU - лише малий кадр
+                gray = self.performance_optimizer.gray_for_ocr_gpu(
+                    self.performance_optimizer.upload_frame(image), PerformanceConfig.OCR_MAX_WIDTH)
             else:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-                enhanced = clahe.apply(gray)
-                _, processed = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            # Спроби з різними конфігураціями
-            configs = [
-                ('ukr+rus+eng', '--psm 6 --oem 3'),  # Найкраща якість
-                ('ukr+rus+eng', '--psm 11 --oem 3'),  # Sparse text
-                ('rus+eng', '--psm 6 --oem 3'),
-                ('ukr', '--psm 6 --oem 3'),
-            ]
+                # Зелений канал як яскравість: зріз замість зваженої суми BGR2GRAY
+                gray = image[:, :, 1] if image.ndim == 3 else image
+                
+                # Зменшення широких кадрів: менше пікселів для фільтрів і Tesseract
+                h, w = gray.shape
+                scale = min(1.0, PerformanceConfig.OCR_MAX_WIDTH / w)
+                if scale < 1.0:
+                    size = (round(w * scale), round(h * scale))
+                    gray = cv2.resize(gray, size, dst=self._scratch('thumb', (size[1], size[0])),
+                                      interpolation=cv2.INTER_AREA)
             
-            best_text = ""
-            best_conf = 0.0
-            best_lines = []
+            # Попередня обробка (сіре зображення - без повторного cvtColor)
+            if self.performance_optimizer:
+                processed = self.performance_optimizer.preprocess_for_ocr(gray, mode='aggressive')
+            else:
+                # Один прохід адаптивного порогу замість CLAHE + Otsu
+                processed = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                                  cv2.THRESH_BINARY, 31, 10,
+                                                  dst=self._scratch('thresh', gray.shape))
             
-            for lang, config in configs:
-                try:
-                    data = pytesseract.image_to_data(
-                        processed, 
-                        lang=lang, 
-                        config=config,
-                        output_type=pytesseract.Output.DICT
-                    )
-                    
-                    # Фільтруємо по впевненості
-                    words = []
-                    confidences = []
-                    
-                    for i in range(len(data['text'])):
-                        conf = int(data['conf'][i])
-                        text = data['text'][i].strip()
-                        
-                        if conf > 30 and text:
-                            words.append(text)
-                            confidences.append(conf)
-                    
-                    if words:
-                        text = " ".join(words)
-                        avg_conf = np.mean(confidences) / 100.0
-                        
-                        if avg_conf > best_conf:
-                            best_conf = avg_conf
-                            best_text = text
-                            best_lines = text.split('\n')
-                
-                except Exception as e:
-                    logging.debug(f"OCR спроба ({lang}): {e}")
-                    continue
+            # Постійний API: одне зображення, перебір лише PSM
+            api = self.tess_api
+            if api is not None:
+                best_text, best_conf, best_lines = self._ocr_with_api(api, processed)
+            else:
+                best_text, best_conf, best_lines = self._ocr_with_pytesseract(processed)
             
             # Кешування
             if best_text and self.performance_optimizer:
-                self.performance_optimizer.cache_ocr_result(
-                    np.array2string(image[:10, :10].flatten()),  # Простий хеш
-                    best_text
-                )
+                self.performance_optimizer.cache_ocr_result(image_hash, best_text)
             
             return best_text, best_conf, best_lines
-            
+        
         except Exception as e:
             logging.error(f"❌ Помилка OCR: {e}")
             return "", 0.0, []
     
-    def _detect_screen_type(self, text: str, lines: List[str]) -> str:
-        """Визначення типу екрану."""
-        # Ігрове поле
-        if any(kw in text for kw in ['полив', 'грунт', 'рослин', 'цибул', 'добрив']):
-            return "gameplay"
+    def _scratch(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Буфер під проміжне зображення; перевиділяється лише при зміні розміру."""
+        buffer = self._scratch_buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._scratch_buffers[name] = buffer
+        return buffer
+    
+    def _ocr_with_api(self, api, processed: np.ndarray) -> Tuple[str, float, List[str]]:
+        """OCR через постійний tesserocr API з раннім виходом."""
+        # Сирі байти 8-бітного зображення напряму: SetImage(PIL) кодує кадр
+        # у BMP/PNG і Leptonica декодує його назад
+        h, w = processed.shape[:2]
+        image_bytes = processed.tobytes()
+        
+        best_text = ""
+        best_conf = 0.0
+        best_lines = []
+        
+        for psm in (tesserocr.PSM.SINGLE_BLOCK, tesserocr.PSM.SPARSE_TEXT):
+            try:
+                # Зображення задається для кожного PSM: SetImage скидає результати
+                # попереднього розпізнавання, інакше GetUTF8Text повернув би їх повторно
+                api.SetPageSegMode(psm)
+                api.SetImageBytes(image_bytes, w, h, 1, w)
+                raw_text = api.GetUTF8Text()
+                word_confs = iter(api.AllWordConfidences())
+                
+                # Фільтруємо слова по впевненості, зберігаючи рядки
+                lines = []
+                confidences = []
+                for raw_line in raw_text.split('\n'):
+                    words = []
+                    for word in raw_line.split():
+                        conf = next(word_confs, 0)
+                        if conf > 30:
+                            words.append(word)
+                            confidences.append(conf)
+                    if words:
+                        lines.append(" ".join(words))
+                
+                if lines:
+                    avg_conf = sum(confidences) / (100.0 * len(confidences))
+                    
+                    if avg_conf > best_conf:
+                        best_conf = avg_conf
+                        best_text = "\n".join(lines)
+                        best_lines = lines
+                
+                if best_conf > PerformanceConfig.OCR_EARLY_EXIT_CONFIDENCE:
+                    break
+            
+            except Exception as e:
+                logging.debug(f"OCR спроба (PSM {psm}): {e}")
+                continue
+        
+        return best_text, best_conf, best_lines
+    
+    def _ocr_with_pytesseract(self, processed: np.ndarray) -> Tuple[str, float, List[str]]:
+        """OCR через pytesseract (запасний варіант без tesserocr)."""
+        # Спочатку конфігурація, що перемогла на попередньому кадрі
+        configs = self.PYTESSERACT_CONFIGS
+        last = self._last_ocr_config
+        if last is not None:
+            configs = (last,) + tuple(c for c in configs if c != last)
+        
+        best_text = ""
+        best_conf = 0.0
+        best_lines = []
+        best_config = None
+        
+        for lang_config, result in self._pytesseract_attempts(processed, configs):
+            if result:
+                avg_conf, text = result
+                
+                if avg_conf > best_conf:
+                    best_conf = avg_conf
+                    best_text = text
+                    best_lines = text.split('\n')
+                    best_config = lang_config
+            
+            # Достатньо впевнено - решту конфігурацій не чекаємо
+            if best_conf > PerformanceConfig.OCR_EARLY_EXIT_CONFIDENCE:
+                break
         
-        # Інвентар
-        if any(kw in text for kw in ['інвентар', 'inventory', 'предмет', 'хімікат']):
-            return "inventory"
+        if best_config is not None:
+            self._last_ocr_config = best_config
         
-        # Магазин
-        if any(kw in text for kw in ['магазин', 'shop', 'купити', 'продати']):
-            return "shop"
+        return best_text, best_conf, best_lines
+    
+    def _pytesseract_attempts(self, processed: np.ndarray, configs: Tuple[Tuple[str, str], ...]):
+        """Спроби OCR по конфігураціях: ((мова, параметри), результат) по черзі."""
+        # Перша (найімовірніша) конфігурація - завжди одна
+        yield configs[0], self._pytesseract_attempt(processed, *configs[0])
+        
+        if self.ocr_pool is None:
+            for lang_config in configs[1:]:
+                yield lang_config, self._pytesseract_attempt(processed, *lang_config)
+            return
+        
+        # Решта - паралельно в окремих процесах tesseract. Копія в PIL, бо
+        # буфер processed перевикористовується наступним кадром
+        image = Image.fromarray(processed)
+        futures = [(lang_config, self.ocr_pool.submit(self._pytesseract_attempt, image, *lang_config))
+                   for lang_config in configs[1:]]
+        for lang_config, future in futures:
+            yield lang_config, future.result()
+    
+    def _pytesseract_attempt(self, image, lang: str, config: str) -> Optional[Tuple[float, str]]:
+        """Одна спроба pytesseract: (середня впевненість, текст) або None."""
+        try:
+            data = pytesseract.image_to_data(
+                image, 
+                lang=lang, 
+                config=config,
+                output_type=pytesseract.Output.DICT
+            )
+            
+            # Фільтруємо по впевненості (маска замість перевірки кожного слова)
+            conf_arr = np.asarray(data['conf'], dtype=np.float32)
+            words = []
+            confidences = []
+            
+            for i in np.flatnonzero(conf_arr > 30):
+                text = data['text'][i].strip()
+                if text:
+                    words.append(text)
+                    confidences.append(float(conf_arr[i]))
+            
+            if words:
+                return sum(confidences) / (100.0 * len(confidences)), " ".join(words)
         
-        # Меню
-        if any(kw in text for kw in ['меню', 'menu', 'налаштування', 'settings']):
-            return "menu"
+        except Exception as e:
+            logging.debug(f"OCR спроба ({lang}): {e}")
+        
+        return None
+    
+    def _detect_screen_type(self, keyword_hits: Dict[str, Set[str]]) -> str:
+        """Визначення типу екрану."""
+        # Ігрове поле -> інвентар -> магазин -> меню
+        for screen in self.SCREEN_KEYWORDS:
+            if screen in keyword_hits['screen']:
+                return screen
         
         return "unknown"
     
-    def _detect_parasites(self, text: str, lines: List[str]) -> List[ParasiteConfig]:
-        """Покращене виявлення паразитів."""
+    def _detect_parasites(self, text_words: List[str], exact_hits: Set[str]) -> List[ParasiteConfig]:
+        """Покращене виявлення паразитів (exact_hits - ключі, знайдені індексом ключових слів)."""
         found = []
         
         for keyword, parasite in self.config.parasites.items():
-            # Перевірка всіх варіантів назв
-            for variant in parasite.name_variants:
-                variant_lower = variant.lower()
-                
-                # Точне співпадіння
-                if variant_lower in text:
-                    if parasite not in found:
-                        found.append(parasite)
-                        logging.debug(f"🎯 Паразит '{parasite.name}' знайдено по варіанту '{variant}'")
-                    break
-                
-                # Нечітке співпадіння (для помилок OCR)
-                if self._fuzzy_match(variant_lower, text):
+            # Точне співпадіння (усі варіанти вже знайдені одним проходом)
+            if keyword in exact_hits:
+                if parasite not in found:
+                    found.append(parasite)
+                    logging.debug(f"🎯 Паразит '{parasite.name}' знайдено (точне)")
+                continue
+            
+            # Нечітке співпадіння (для помилок OCR) - тільки для решти
+            for variant in parasite.variants_lower:
+                if self._fuzzy_match(variant, text_words):
                     if parasite not in found:
                         found.append(parasite)
-                        logging.debug(f"🎯 Паразит '{parasite.name}' знайдено (нечітке)")
+                        logging.debug(f"🎯 Паразит '{parasite.name}' знайдено по варіанту '{variant}' (нечітке)")
                     break
         
         return found
     
-    def _fuzzy_match(self, pattern: str, text: str, threshold: float = 0.8) -> bool:
+    def _fuzzy_match(self, pattern: str, text_words: List[str], threshold: float = 0.8) -> bool:
         """Нечітке співпадіння для помилок OCR."""
-        from difflib import SequenceMatcher
+        # Пропускаємо короткі слова
+        pattern_words = [pw for pw in pattern.split() if len(pw) >= 3]
+        if not pattern_words or not text_words:
+            return False
+        
+        if fuzz_process is not None:
+            # Уся матриця слово×слово одним викликом у C++
+            scores = fuzz_process.cdist(pattern_words, text_words, scorer=fuzz.ratio,
+                                        score_cutoff=threshold * 100)
+            return bool(scores.any())
         
-        # Розбиваємо на слова
-        pattern_words = pattern.split()
-        text_words = text.split()
+        from difflib import SequenceMatcher
         
         for pw in pattern_words:
-            if len(pw) < 3:  # Пропускаємо короткі слова
-                continue
-            
             for tw in text_words:
                 ratio = SequenceMatcher(None, pw, tw).ratio()
                 if ratio >= threshold:
@@ -487,85 +933,58 @@ class SmartAnalyzer:
         
         return False
     
-    def _analyze_water_status(self, text: str, lines: List[str]) -> dict:
+    def _parse_screen_values(self, text: str) -> Tuple[Optional[float], Optional[int]]:
+        """Парсинг кількості води та рівня грунту за один прохід."""
+        first_matches = {}
+        for match in self.SCREEN_VALUES_RE.finditer(text):
+            group = match.lastgroup
+            if group == 'litres_word':
+                # "N літр" - це водночас і збіг "N л"
+                value = match.group('litres')
+                first_matches.setdefault('litres', value)
+            else:
+                value = match.group(group)
+            first_matches.setdefault(group, value)
+        
+        amount = None
+        for group in self.WATER_AMOUNT_GROUPS:
+            if group in first_matches:
+                try:
+                    value = float(first_matches[group].replace(",", "."))
+                except ValueError:
+                    continue
+                if 0.5 <= value <= 10:  # Валідація
+                    amount = value
+                    break
+        
+        soil = None
+        for group in self.SOIL_LEVEL_GROUPS:
+            if group in first_matches:
+                level = int(first_matches[group])
+                if 0 <= level <= 100:
+                    soil = level
+                    break
+        
+        return amount, soil
+    
+    def _analyze_water_status(self, keyword_hits: Dict[str, Set[str]], amount: Optional[float]) -> dict:
         """Контекстний аналіз рівня води."""
-        info = {'low': False, 'amount': None, 'keywords': []}
+        info = {'low': False, 'amount': amount, 'keywords': []}
         
         # Ключові слова про низьку воду
-        low_water_keywords = [
-            'мало води', 'низьк', 'недостатн', 'потрібн', 
-            'треба полив', 'додати вод', 'долити',
-            'water low', 'need water'
-        ]
-        
-        for keyword in low_water_keywords:
-            if keyword in text:
-                info['low'] = True
-                info['keywords'].append(keyword)
-        
-        # Парсинг кількості
-        patterns = [
-            r'(\d+[\.,]?\d*)\s*л',
-            r'(\d+[\.,]?\d*)\s*літр',
-            r'води.*?(\d+[\.,]?\d*)',
-            r'налити.*?(\d+[\.,]?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                try:
-                    amount = float(match.group(1).replace(",", "."))
-                    if 0.5 <= amount <= 10:  # Валідація
-                        info['amount'] = amount
-                        break
-                except (ValueError, IndexError):
-                    pass
+        info['keywords'] = [kw for kw in self.LOW_WATER_KEYWORDS if kw in keyword_hits['water_low']]
+        info['low'] = bool(info['keywords'])
         
         return info
     
-    def _check_fertilizer_need(self, text: str, lines: List[str]) -> bool:
+    def _check_fertilizer_need(self, keyword_hits: Dict[str, Set[str]]) -> bool:
         """Перевірка потреби в добриві."""
-        fertilizer_keywords = [
-            'добрив', 'азотн', 'fertilizer', 'nitrogen',
-            'підживлення', 'удобрение'
-        ]
-        
-        return any(kw in text for kw in fertilizer_keywords)
-    
-    def _parse_soil_level(self, text: str) -> Optional[int]:
-        """Парсинг рівня грунту."""
-        patterns = [
-            r'грунт.*?(\d+)\s*%',
-            r'soil.*?(\d+)\s*%',
-            r'земл.*?(\d+)\s*%'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                level = int(match.group(1))
-                if 0 <= level <= 100:
-                    return level
-        
-        return None
+        return bool(keyword_hits['fertilizer'])
     
-    def _detect_ui_elements(self, text: str, lines: List[str]) -> List[str]:
+    def _detect_ui_elements(self, keyword_hits: Dict[str, Set[str]]) -> List[str]:
         """Виявлення UI елементів."""
-        elements = []
-        
-        ui_keywords = {
-            'button_watering': ['полити', 'water', 'лейка'],
-            'button_chemical': ['хімікат', 'chemical', 'обробити'],
-            'status_bar': ['здоров', 'health', 'енергія', 'energy'],
-            'inventory': ['інвентар', 'inventory'],
-        }
-        
-        for element_type, keywords in ui_keywords.items():
-            if any(kw in text for kw in keywords):
-                elements.append(element_type)
-        
-        return elements
+        return [element_type for element_type in self.UI_KEYWORDS
+                if element_type in keyword_hits['ui']]
     
     def _calculate_confidence(self, analysis: ScreenAnalysis) -> float:
         """Розрахунок загальної впевненості аналізу - ПОКРАЩЕНО."""
@@ -611,16 +1030,15 @@ class SmartAnalyzer:
     
     def can_perform_action(self, action_key: str, cooldown: Optional[float] = None) -> bool:
         """Перевірка cooldown для дії."""
-        cooldown = cooldown or self.default_cooldown
-        current_time = time.time()
+        now_ns = time.monotonic_ns()
+        next_allowed_ns = self._next_allowed_ns.get(action_key, 0)
         
-        last_time = self.action_cooldowns.get(action_key, 0)
-        
-        if current_time - last_time >= cooldown:
-            self.action_cooldowns[action_key] = current_time
+        if now_ns >= next_allowed_ns:
+            cooldown = cooldown or self.default_cooldown
+            self._next_allowed_ns[action_key] = now_ns + int(cooldown * 1e9)
             return True
         
-        remaining = cooldown - (current_time - last_time)
+        remaining = (next_allowed_ns - now_ns) / 1e9
         logging.debug(f"⏳ Cooldown для '{action_key}': {remaining:.1f}с")
         return False
     
@@ -630,9 +1048,14 @@ class SmartAnalyzer:
         if self.stats['scans_total'] > 0:
             success_rate = (self.stats['scans_successful'] / self.stats['scans_total']) * 100
         
+        p99_analysis_time = 0.0
+        if self._analysis_times:
+            p99_analysis_time = float(np.percentile(self._analysis_times, 99))
+        
         return {
             **self.stats,
             'success_rate': success_rate,
+            'p99_analysis_time': p99_analysis_time,
             'game_context': self.game_context.get_status_summary()
         }
     
@@ -643,8 +1066,9 @@ class SmartAnalyzer:
         logging.info("=" * 80)
         logging.info("📊 СТАТИСТИКА АНАЛІЗАТОРА:")
         logging.info(f"   🔍 Сканів: {stats['scans_total']} (успішних: {stats['scans_successful']}, {stats['success_rate']:.1f}%)")
+        logging.info(f"   ⏭️ Незмінних кадрів: {stats['frames_unchanged']}")
         logging.info(f"   🐛 Паразитів виявлено: {stats['parasites_detected']}")
         logging.info(f"   💧 Попереджень про воду: {stats['water_warnings']}")
-        logging.info(f"   ⏱️ Середній час аналізу: {stats['avg_analysis_time']*1000:.1f}ms")
+        logging.info(f"   ⏱️ Середній час аналізу: {stats['avg_analysis_time']*1000:.1f}ms (p99: {stats['p99_analysis_time']*1000:.1f}ms)")
         logging.info(f"   🎮 Контекст: {stats['game_context']}")
         logging.info("=" * 80)
\ No newline at end of file
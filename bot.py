@@ -1,17 +1,19 @@
 """
 bot.py - Повністю інтегрований Plant Care Bot v2.1 - ВИПРАВЛЕНО
 """
-import threading
+import asyncio
 import time
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Optional
 from pathlib import Path
 
+import pyautogui
 import pytesseract
 
 from config import (
     ConfigParser, TaskConfig, PerformanceConfig,
-    CONFIG_FILE, TESSERACT_PATH, setup_enhanced_logging
+    CONFIG_FILE, TESSERACT_PATH, setup_enhanced_logging, flush_logging
 )
 from analyzer import SmartAnalyzer
 from executor import SmartExecutor
@@ -24,13 +26,17 @@ from performance_optimizer import PerformanceOptimizer
 class PlantCareBot:
     """Повністю автономний Plant Care Bot з максимальною продуктивністю."""
     
-    def __init__(self, log_callback=None):
+    def __init__(self, log_callback=None, stats_callback=None):
         # Стан
         self._running = False
         self._paused = False
-        self._thread: Optional[threading.Thread] = None
+        self._pause_epoch = 0  # Зростає при кожній паузі: кадри з попередньої епохи застаріли
+        self._pool: Optional[ThreadPoolExecutor] = None  # Цикл моніторингу + дії
+        self._monitor_future: Optional[Future] = None
         self._log_callback = log_callback
+        self._stats_callback = stats_callback  # Виклик після зміни лічильників (замість опитування GUI)
         self._shutdown_requested = False
+        self._consecutive_errors = 0
         
         # Ініціалізація системи логування
         setup_enhanced_logging()
@@ -48,29 +54,42 @@ class PlantCareBot:
         # Ініціалізація компонентів
         logging.info("🔧 Ініціалізація компонентів...")
         
-        # Performance Optimizer (GPU/CPU)
-        self.performance_optimizer = PerformanceOptimizer()
-        
-        # Window Manager (фокус на грі)
-        if self.config.focus_game_window:
-            self.window_manager = WindowManager(self.config.window_process_name)
-            if not self.window_manager.find_game_window():
-                logging.warning("⚠️ Вікно гри не знайдено, буде працювати на всьому екрані")
-        else:
-            self.window_manager = None
-        
-        # Smart Inventory (пошук хімікатів та перевірка води)
-        self.smart_inventory = SmartInventory(
-            window_manager=self.window_manager,
-            performance_optimizer=self.performance_optimizer
-        )
-        
-        # Smart Analyzer (розпізнавання тексту та контекст)
-        self.analyzer = SmartAnalyzer(
-            config=self.config,
-            window_manager=self.window_manager,
-            performance_optimizer=self.performance_optimizer
-        )
+        # Пул для паралельних викликів Tesseract (кожен - однопотоковий)
+        self._ocr_pool = self._create_ocr_pool()
+        
+        # Незалежні компоненти створюються паралельно (ініціалізація CUDA,
+        # завантаження мовних моделей, пошук вікна та шаблонів - здебільшого I/O)
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix='init') as init_pool:
+            # Performance Optimizer (GPU/CPU)
+            optimizer_future = init_pool.submit(PerformanceOptimizer)
+            # Постійний Tesseract API на весь час роботи (замість процесу tesseract.exe на кожен кадр)
+            tess_future = init_pool.submit(SmartAnalyzer.create_tess_api)
+            # Window Manager (фокус на грі)
+            window_future = init_pool.submit(self._create_window_manager)
+            
+            self.performance_optimizer = optimizer_future.result()
+            self._tess_api = tess_future.result()
+            self.window_manager = window_future.result()
+            
+            # Smart Inventory (пошук хімікатів та перевірка води)
+            inventory_future = init_pool.submit(
+                SmartInventory,
+                window_manager=self.window_manager,
+                performance_optimizer=self.performance_optimizer
+            )
+            
+            # Smart Analyzer (розпізнавання тексту та контекст)
+            analyzer_future = init_pool.submit(
+                SmartAnalyzer,
+                config=self.config,
+                window_manager=self.window_manager,
+                performance_optimizer=self.performance_optimizer,
+                ocr_pool=self._ocr_pool,
+                tess_api=self._tess_api
+            )
+            
+            self.smart_inventory = inventory_future.result()
+            self.analyzer = analyzer_future.result()
         
         # Smart Executor (виконання дій)
         self.executor = SmartExecutor(
@@ -82,10 +101,18 @@ class PlantCareBot:
         # Автоматичне налаштування UI області
         self.analyzer.auto_detect_game_ui()
         
+        # Буфер кадру на весь екран (BGRA), перевикористовується кожним сканом
+        screen_width, screen_height = pyautogui.size()
+        self._frame_buffer = bytearray(screen_width * screen_height * 4)
+        self._frame_view = memoryview(self._frame_buffer)
+        
         # Параметри моніторингу
-        self.poll_interval = 2.0  # Інтервал сканування
+        self.poll_interval = 2.0  # Інтервал сканування (адаптивний, див. _adapt_poll_interval)
+        self._min_poll = 2.0
+        self._max_poll = 16.0  # Стеля інтервалу, коли на екрані нічого не відбувається
+        self._idle_scans = 0
         self.stats_log_interval = 60.0  # Логування статистики кожні 60с
-        self.last_stats_log = 0
+        self.last_stats_log = 0.0  # time.perf_counter()
         
         # Загальна статистика
         self.stats = {
@@ -98,10 +125,31 @@ class PlantCareBot:
         }
         
         logging.info("✅ Бот успішно ініціалізовано!")
+        self._status_banner = self._build_status_banner()
         self._log_system_status()
     
+    def _create_window_manager(self) -> Optional[WindowManager]:
+        """Window Manager для вікна гри (None - фокус вимкнено в конфігурації)."""
+        if not self.config.focus_game_window:
+            return None
+        
+        window_manager = WindowManager(self.config.window_process_name)
+        if not window_manager.find_game_window():
+            logging.warning("⚠️ Вікно гри не знайдено, буде працювати на всьому екрані")
+        return window_manager
+    
+    @staticmethod
+    def _create_pool() -> ThreadPoolExecutor:
+        """Пул бота: один потік під цикл моніторингу, один - під виконання дій."""
+        return ThreadPoolExecutor(max_workers=2, thread_name_prefix='pcb')
+    
+    @staticmethod
+    def _create_ocr_pool() -> ThreadPoolExecutor:
+        """Пул потоків для паралельних викликів Tesseract."""
+        return ThreadPoolExecutor(max_workers=PerformanceConfig.CPU_THREADS, thread_name_prefix='ocr')
+    
     def _check_tesseract(self) -> bool:
-        """Перевірка Tesseract OCR."""
+        """Перевірка Tesseract OCR (OMP_THREAD_LIMIT задає analyzer.py до імпорту tesseract)."""
         try:
             if Path(TESSERACT_PATH).exists():
                 pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
@@ -115,9 +163,9 @@ class PlantCareBot:
                 
                 if missing_langs:
                     logging.warning(f"⚠️ Відсутні мови: {', '.join(missing_langs)}")
-                    logging.warning("⚠️ Завантажте з https://github.com/tesseract-ocr/tessdata")
+                    logging.warning("⚠️ Завантажте з https://github.com/tesseract-ocr/tessdata_fast")
                 else:
-                    logging.info(f"✅ Мови: {', '.join(required_langs)}")
+                    logging.info(f"✅ Мови: {', '.join(required_langs)} (рекомендовано моделі tessdata_fast)")
                 
                 return True
             else:
@@ -129,29 +177,36 @@ class PlantCareBot:
             return False
     
     def _log_system_status(self):
-        """Логування стану системи."""
-        logging.info("=" * 80)
-        logging.info("🌱 PLANT CARE BOT v2.1 - ГОТОВИЙ ДО РОБОТИ (FIXED)")
-        logging.info("=" * 80)
-        logging.info(f"📝 Конфігурація:")
-        logging.info(f"   • Паразитів у базі: {len(self.config.parasites)}")
-        logging.info(f"   • Базовий полив: {self.config.watering_amount}л")
-        logging.info(f"   • З добривом: {self.config.fertilizer_amount}л")
-        logging.info(f"   • Діапазон води: {self.config.water_range[0]}-{self.config.water_range[1]}л")
-        logging.info(f"   • Рівень грунту: {self.config.soil_percentage}%")
-        logging.info("")
-        logging.info(f"🎮 Компоненти:")
-        logging.info(f"   • Window Manager: {'✅' if self.window_manager else '❌'}")
-        logging.info(f"   • Smart Inventory: ✅")
-        logging.info(f"   • Performance Optimizer: ✅")
-        logging.info(f"   • GPU прискорення: {'✅' if self.performance_optimizer.gpu_available else '❌'}")
-        logging.info("")
-        logging.info(f"⚙️ Налаштування:")
-        logging.info(f"   • Інтервал сканування: {self.poll_interval}с")
-        logging.info(f"   • Інтервал скріншотів: {self.analyzer.screenshot_interval}с")
-        logging.info(f"   • CPU потоків: {PerformanceConfig.CPU_THREADS}")
-        logging.info(f"   • Масштабування скріншотів: {PerformanceConfig.SCREENSHOT_SCALE*100:.0f}%")
-        logging.info("=" * 80)
+        """Логування стану системи (одним записом)."""
+        logging.info(self._status_banner)
+    
+    def _build_status_banner(self) -> str:
+        """Банер стану системи - усі значення відомі після ініціалізації."""
+        lines = [
+            "=" * 80,
+            "🌱 PLANT CARE BOT v2.1 - ГОТОВИЙ ДО РОБОТИ (FIXED)",
+            "=" * 80,
+            "📝 Конфігурація:",
+            f"   • Паразитів у базі: {len(self.config.parasites)}",
+            f"   • Базовий полив: {self.config.watering_amount}л",
+            f"   • З добривом: {self.config.fertilizer_amount}л",
+            f"   • Діапазон води: {self.config.water_range[0]}-{self.config.water_range[1]}л",
+            f"   • Рівень грунту: {self.config.soil_percentage}%",
+            "",
+            "🎮 Компоненти:",
+            f"   • Window Manager: {'✅' if self.window_manager else '❌'}",
+            "   • Smart Inventory: ✅",
+            "   • Performance Optimizer: ✅",
+            f"   • GPU прискорення: {'✅' if self.performance_optimizer.gpu_available else '❌'}",
+            "",
+            "⚙️ Налаштування:",
+            f"   • Інтервал сканування: {self._min_poll}-{self._max_poll}с (адаптивний)",
+            f"   • Інтервал скріншотів: {self.analyzer.screenshot_interval}с",
+            f"   • CPU потоків: {PerformanceConfig.CPU_THREADS}",
+            f"   • Масштабування скріншотів: {PerformanceConfig.SCREENSHOT_SCALE*100:.0f}%",
+            "=" * 80,
+        ]
+        return "\n".join(lines)
     
     def start(self):
         """Запуск бота."""
@@ -159,18 +214,31 @@ class PlantCareBot:
             self._log("⚠️ Бот вже працює")
             return
         
+        if self._ocr_pool is None:
+            self._ocr_pool = self._create_ocr_pool()
+            self.analyzer.ocr_pool = self._ocr_pool
+        
+        if self._tess_api is None:
+            self._tess_api = SmartAnalyzer.create_tess_api()
+            self.analyzer.tess_api = self._tess_api
+        
+        if self._pool is None:
+            self._pool = self._create_pool()
+        
         self._running = True
         self._paused = False
         self._shutdown_requested = False
-        self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._thread.start()
+        self._adapt_poll_interval(True)
+        self._monitor_future = self._pool.submit(self._monitor_loop)
         
+        self._log_system_status()
         self._log("▶️ Моніторинг запущено")
         logging.info("🔄 Головний цикл розпочато")
     
     def pause(self):
         """Призупинення роботи."""
         self._paused = True
+        self._pause_epoch += 1
         self._log("⏸️ Призупинено")
         logging.info("⏸️ Бот призупинено")
     
@@ -182,7 +250,9 @@ class PlantCareBot:
     
     def stop(self):
         """Зупинка бота."""
-        if not self._running:
+        # Не за _running: після зупинки через помилки (_handle_loop_error) пули
+        # і Tesseract API ще живі - їх треба звільнити
+        if self._pool is None and self._monitor_future is None:
             return
         
         self._log("⏹️ Зупинка...")
@@ -191,9 +261,15 @@ class PlantCareBot:
         self._running = False
         self._shutdown_requested = True
         
-        # Очікування завершення потоку
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5.0)
+        # Очікування завершення циклу
+        if self._monitor_future is not None:
+            wait([self._monitor_future], timeout=5.0)
+            self._monitor_future = None
+        
+        # Пул бота (буде створено заново при наступному start())
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
         
         # Логування фінальної статистики
         self._log_final_stats()
@@ -202,6 +278,18 @@ class PlantCareBot:
         if self.performance_optimizer:
             self.performance_optimizer.shutdown()
         
+        # Пул OCR (буде створено заново при наступному start())
+        if self._ocr_pool is not None:
+            self._ocr_pool.shutdown(wait=False)
+            self._ocr_pool = None
+            self.analyzer.ocr_pool = None
+        
+        # Tesseract API: End() у потоці аналізу, щоб не закрити його посеред кадру
+        if self._tess_api is not None:
+            self.analyzer.tess_api = None
+            self.analyzer.run_after_analysis(self._tess_api.End)
+            self._tess_api = None
+        
         if self.smart_inventory:
             self.smart_inventory.log_stats()
         
@@ -213,6 +301,9 @@ class PlantCareBot:
         
         self._log("⏹️ Зупинено")
         logging.info("✅ Бот успішно зупинено")
+        
+        # Дописуємо логи з черги на диск
+        flush_logging()
     
     def set_watering_point(self):
         """Встановлення точки поливу."""
@@ -228,136 +319,225 @@ class PlantCareBot:
             self._log(f"📍 Область встановлено: ({x1},{y1}) - ({x2},{y2})")
     
     def _monitor_loop(self):
+        """Цикл моніторингу в пулі бота: власний asyncio event loop."""
+        try:
+            asyncio.run(self._monitor_loop_async())
+        except Exception as e:
+            # Future з пулу мовчки ковтає виняток - логуємо самі
+            logging.error(f"❌ Критична помилка циклу моніторингу: {e}", exc_info=True)
+            self._running = False
+    
+    async def _monitor_loop_async(self):
         """
         Головний цикл моніторингу з розумною обробкою.
         
+        Конвеєр з двох етапів: поки виконуються дії по кадру N, захоплення
+        та OCR кадру N+1 вже йдуть у фоні. Черга на 2 кадри стримує
+        захоплення, якщо дії не встигають.
+        
         ВИПРАВЛЕННЯ:
         - Знижено поріг впевненості з 30% до 15%
         - Додано детальне логування розпізнаного тексту
         - Покращена діагностика
         """
-        consecutive_errors = 0
-        max_errors = 5
-        start_time = time.time()
+        self._consecutive_errors = 0
+        start_time = time.perf_counter()
         
         logging.info("🔄 Головний цикл моніторингу розпочато (FIXED)")
         logging.info(f"⏱️ Параметри: сканування={self.poll_interval}с, скріншоти={self.analyzer.screenshot_interval}с")
         logging.info(f"🎯 Поріг впевненості: 15% (було 30%)")
         
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        
+        capture_task = asyncio.create_task(self._capture_stage(queue))
+        try:
+            await self._action_stage(queue, self._pool)
+        finally:
+            capture_task.cancel()
+            await asyncio.gather(capture_task, return_exceptions=True)
+        
+        # Розрахунок uptime
+        self.stats['uptime'] = int(time.perf_counter() - start_time)
+        
+        logging.info("🔄 Головний цикл завершено")
+    
+    async def _capture_stage(self, queue: asyncio.Queue):
+        """Етап 1: захоплення та аналіз кадрів з інтервалом poll_interval."""
         while self._running and not self._shutdown_requested:
             try:
                 # Пауза
                 if self._paused:
-                    time.sleep(0.2)
+                    await asyncio.sleep(0.2)
                     continue
                 
-                loop_start = time.time()
+                loop_start = time.perf_counter()
                 self.stats['scans'] += 1
+                scan_no = self.stats['scans']
+                epoch = self._pause_epoch
                 
                 # ============ АНАЛІЗ ============
-                logging.debug(f"🔍 Скан #{self.stats['scans']}...")
-                analysis = self.analyzer.analyze_screen(save_screenshot=True)
-                
-                # ============ ДЕТАЛЬНЕ ЛОГУВАННЯ (НОВE!) ============
-                if analysis.text:
-                    preview = analysis.text[:150].replace('\n', ' ')
-                    log_msg = f"🔍 Скан #{self.stats['scans']}: '{preview}...'"
-                    
-                    # Показуємо що знайдено
-                    logging.info(log_msg)
-                    logging.info(f"   📊 OCR: {analysis.text_confidence:.1%}, Загальна: {analysis.confidence:.1%}")
-                    
-                    # Ключові слова
-                    keywords = ['полив', 'вода', 'рослин', 'грунт', 'добрив', 'літр', 'паразит', 
-                                'тля', 'слизн', 'жук', 'медвед', 'трипс', 'клещ']
-                    found_keywords = [kw for kw in keywords if kw in analysis.text.lower()]
-                    if found_keywords:
-                        logging.info(f"   🔑 Ключові слова: {', '.join(found_keywords)}")
-                    
-                    # Додаткова інформація
-                    if analysis.parasites_found or analysis.water_level_low:
-                        log_msg += f"\n   📊 {analysis.get_summary()}"
-                        logging.info(f"   🎯 {analysis.get_summary()}")
-                else:
-                    logging.debug(f"⏭️ Скан #{self.stats['scans']}: текст не знайдено")
-                
-                # ============ ВИКОНАННЯ ДІЙ (ВИПРАВЛЕНО!) ============
-                # БУЛО: if analysis.confidence > 0.3
-                # СТАЛО: if analysis.confidence > 0.15
-                if analysis.confidence > 0.15:  # ← ГОЛОВНЕ ВИПРАВЛЕННЯ!
-                    logging.info(f"✅ Впевненість {analysis.confidence:.1%} >= 15% - виконую дії")
-                    
-                    # Підрахунок паразитів
-                    if analysis.parasites_found:
-                        self.stats['parasites_found'] += len(analysis.parasites_found)
-                    
-                    # Виконання через Smart Executor
-                    executed = self.executor.execute(analysis)
-                    
-                    if executed:
-                        self.stats['actions'] += 1
-                        action_msg = f"✅ Дію виконано (всього: {self.stats['actions']})"
-                        self._log(action_msg)
-                        logging.info(action_msg)
-                    else:
-                        logging.debug("⏭️ Дій не виконано (cooldown або інше)")
-                else:
-                    # Покращене логування причини пропуску
-                    logging.warning(f"⏭️ ПРОПУСК: впевненість {analysis.confidence:.1%} < 15%")
-                    if analysis.text:
-                        logging.info(f"   📝 Розпізнано: {len(analysis.text)} символів")
-                        logging.info(f"   💡 Можливо потрібно покращити область аналізу або якість OCR")
-                
-                # ============ ПЕРІОДИЧНІ ПЕРЕВІРКИ ============
-                # Логування статистики кожні 60 секунд
-                if time.time() - self.last_stats_log > self.stats_log_interval:
-                    self._log_periodic_stats()
-                    self.last_stats_log = time.time()
-                
-                # Очищення старих скріншотів (кожні 5 хвилин)
-                if self.stats['scans'] % 150 == 0:
-                    if self.performance_optimizer:
-                        self.performance_optimizer.cleanup_old_screenshots(max_age_hours=24)
-                
-                # Скидання лічильника помилок
-                consecutive_errors = 0
+                if logging.root.isEnabledFor(logging.DEBUG):
+                    logging.debug(f"🔍 Скан #{scan_no}...")
+                analysis = await asyncio.wrap_future(self.analyzer.analyze_screen_async(
+                    save_screenshot=True, buffer=self._frame_view,
+                    gpu=self.performance_optimizer.ocr_on_gpu))
+                await queue.put((scan_no, analysis, epoch))
                 
                 # ============ ОЧІКУВАННЯ ============
-                elapsed = time.time() - loop_start
+                elapsed = time.perf_counter() - loop_start
                 sleep_time = max(0.1, self.poll_interval - elapsed)
                 
-                logging.debug(f"⏸️ Очікування {sleep_time:.1f}с до наступного скану...")
-                time.sleep(sleep_time)
-                
-            except KeyboardInterrupt:
-                logging.info("⚠️ Отримано сигнал переривання")
+                if logging.root.isEnabledFor(logging.DEBUG):
+                    logging.debug(f"⏸️ Очікування {sleep_time:.1f}с до наступного скану...")
+                await self._interruptible_sleep(sleep_time)
+            
+            except asyncio.CancelledError:
+                raise
+            
+            except Exception as e:
+                if self._handle_loop_error(e):
+                    break
+                await asyncio.sleep(self.poll_interval)
+        
+        await queue.put(None)  # Кінець потоку кадрів
+    
+    async def _interruptible_sleep(self, seconds: float):
+        """Очікування, яке завершується одразу після stop() (інтервал може сягати _max_poll)."""
+        deadline = time.perf_counter() + seconds
+        while self._running and not self._shutdown_requested:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
                 break
+            await asyncio.sleep(min(remaining, 0.5))
+    
+    async def _action_stage(self, queue: asyncio.Queue, action_pool: ThreadPoolExecutor):
+        """Етап 2: логування та виконання дій по готових аналізах."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            item = await queue.get()
+            if item is None or not self._running or self._shutdown_requested:
+                break
+            
+            # Пауза: черга вичерпується без дій, кадри до паузи - застарілі
+            scan_no, analysis, epoch = item
+            if self._paused or epoch != self._pause_epoch:
+                logging.debug(f"⏭️ Скан #{scan_no} відкинуто (пауза)")
+                continue
+            
+            try:
+                await loop.run_in_executor(action_pool, self._process_analysis, scan_no, analysis)
+                self._notify_stats()
                 
+                # Скидання лічильника помилок
+                self._consecutive_errors = 0
+            
             except Exception as e:
-                consecutive_errors += 1
-                self.stats['errors'] += 1
-                
-                logging.error(
-                    f"❌ Помилка циклу (спроба {consecutive_errors}/{max_errors}): {e}",
-                    exc_info=True
-                )
-                
-                if consecutive_errors >= max_errors:
-                    self._log("🛑 Критична кількість помилок, зупинка")
-                    logging.critical("🛑 Досягнуто максимум помилок, аварійна зупинка")
-                    
-                    if self.executor:
-                        self.executor.emergency_stop()
-                    
-                    self._running = False
+                stop = self._handle_loop_error(e)
+                self._notify_stats()
+                if stop:
                     break
-                
-                time.sleep(self.poll_interval)
+                await asyncio.sleep(self.poll_interval)
+    
+    def _process_analysis(self, scan_no: int, analysis):
+        """Обробка одного аналізу: логування, дії та періодичні перевірки."""
+        # ============ ДЕТАЛЬНЕ ЛОГУВАННЯ (НОВE!) ============
+        if analysis.text:
+            preview = analysis.text[:150].replace('\n', ' ')
+            log_msg = f"🔍 Скан #{scan_no}: '{preview}...'"
+            
+            # Показуємо що знайдено
+            logging.info(log_msg)
+            logging.info(f"   📊 OCR: {analysis.text_confidence:.1%}, Загальна: {analysis.confidence:.1%}")
+            
+            # Ключові слова (вже знайдені аналізатором за один прохід)
+            if analysis.keywords_found:
+                logging.info(f"   🔑 Ключові слова: {', '.join(analysis.keywords_found)}")
+            
+            # Додаткова інформація
+            if analysis.parasites_found or analysis.water_level_low:
+                log_msg += f"\n   📊 {analysis.get_summary()}"
+                logging.info(f"   🎯 {analysis.get_summary()}")
+        elif logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f"⏭️ Скан #{scan_no}: текст не знайдено")
+        
+        # ============ ВИКОНАННЯ ДІЙ (ВИПРАВЛЕНО!) ============
+        # БУЛО: if analysis.confidence > 0.3
+        # СТАЛО: if analysis.confidence > 0.15
+        if analysis.confidence > 0.15:  # ← ГОЛОВНЕ ВИПРАВЛЕННЯ!
+            logging.info(f"✅ Впевненість {analysis.confidence:.1%} >= 15% - виконую дії")
+            
+            # Підрахунок паразитів
+            if analysis.parasites_found:
+                self.stats['parasites_found'] += len(analysis.parasites_found)
+            
+            # Виконання через Smart Executor
+            executed = self.executor.execute(analysis)
+            
+            self._adapt_poll_interval(executed or bool(analysis.parasites_found or analysis.water_level_low))
+            
+            if executed:
+                self.stats['actions'] += 1
+                action_msg = f"✅ Дію виконано (всього: {self.stats['actions']})"
+                self._log(action_msg)
+                logging.info(action_msg)
+            else:
+                logging.debug("⏭️ Дій не виконано (cooldown або інше)")
+        else:
+            # Покращене логування причини пропуску
+            logging.warning(f"⏭️ ПРОПУСК: впевненість {analysis.confidence:.1%} < 15%")
+            self._adapt_poll_interval(False)
+            if analysis.text:
+                logging.info(f"   📝 Розпізнано: {len(analysis.text)} символів")
+                logging.info(f"   💡 Можливо потрібно покращити область аналізу або якість OCR")
+        
+        # ============ ПЕРІОДИЧНІ ПЕРЕВІРКИ ============
+        # Логування статистики кожні 60 секунд
+        now = time.perf_counter()
+        if now - self.last_stats_log > self.stats_log_interval:
+            self._log_periodic_stats()
+            self.last_stats_log = now
+        
+        # Очищення старих скріншотів (кожні 5 хвилин)
+        if scan_no % 150 == 0:
+            if self.performance_optimizer:
+                self.performance_optimizer.cleanup_old_screenshots(max_age_hours=24)
+    
+    def _adapt_poll_interval(self, active: bool):
+        """Подвоєння інтервалу після кількох порожніх сканів, скидання - коли є що робити."""
+        if active:
+            self._idle_scans = 0
+            self.poll_interval = self._min_poll
+            return
         
-        # Розрахунок uptime
-        self.stats['uptime'] = int(time.time() - start_time)
+        self._idle_scans += 1
+        if self._idle_scans >= 3 and self.poll_interval < self._max_poll:
+            self.poll_interval = min(self._max_poll, self.poll_interval * 2)
+            self._idle_scans = 0
+            logging.debug(f"💤 Нічого не відбувається - інтервал сканування {self.poll_interval:.0f}с")
+    
+    def _handle_loop_error(self, error: Exception) -> bool:
+        """Облік помилки циклу. True - досягнуто максимум, цикл треба зупинити."""
+        max_errors = 5
+        self._consecutive_errors += 1
+        self.stats['errors'] += 1
         
-        logging.info("🔄 Головний цикл завершено")
+        logging.error(
+            f"❌ Помилка циклу (спроба {self._consecutive_errors}/{max_errors}): {error}",
+            exc_info=error
+        )
+        
+        if self._consecutive_errors >= max_errors:
+            self._log("🛑 Критична кількість помилок, зупинка")
+            logging.critical("🛑 Досягнуто максимум помилок, аварійна зупинка")
+            
+            if self.executor:
+                self.executor.emergency_stop()
+            
+            self._running = False
+            return True
+        
+        return False
     
     def _log_periodic_stats(self):
         """Періодичне логування статистики."""
@@ -368,7 +548,7 @@ class PlantCareBot:
         logging.info(f"   🔍 Сканів: {self.stats['scans']}")
         logging.info(f"   ⚡ Дій: {self.stats['actions']}")
         logging.info(f"   🐛 Паразитів: {self.stats['parasites_found']}")
-        logging.info(f"   💧 Поливів: {self.executor.stats['waterings_performed'] if self.executor else 0}")
+        logging.info(f"   💧 Поливів: {self.executor.stats.waterings_performed if self.executor else 0}")
         logging.info(f"   ❌ Помилок: {self.stats['errors']}")
         
         # Ефективність
@@ -406,6 +586,14 @@ class PlantCareBot:
             except Exception as e:
                 logging.debug(f"Помилка GUI callback: {e}")
     
+    def _notify_stats(self):
+        """Повідомлення GUI про зміну статистики."""
+        if self._stats_callback:
+            try:
+                self._stats_callback()
+            except Exception as e:
+                logging.debug(f"Помилка GUI callback: {e}")
+    
     def get_full_stats(self) -> dict:
         """Повна статистика всіх компонентів."""
         stats = {
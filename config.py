@@ -2,14 +2,25 @@
 config.py - Конфігурація бота з оптимізацією
 """
 import re
+import sys
+import queue
+import atexit
 import logging
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+import logging.handlers
+import functools
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 # ======================== ШЛЯХИ ========================
 TESSERACT_PATH = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+TESSDATA_PATH = str(Path(TESSERACT_PATH).parent / 'tessdata')
 LOGS_DIR = Path("logs")
 SCREENSHOTS_DIR = LOGS_DIR / "screenshots"
 CONFIG_FILE = Path("tasks.txt")
@@ -28,6 +39,12 @@ class PerformanceConfig:
     # GPU налаштування
     USE_GPU = True  # Використання CUDA для OpenCV
     GPU_THREADS = 8  # Потоки для GPU операцій
+    # OpenCL (T-API) для обробки перед OCR, коли CUDA недоступна. i5-13400F не має
+    # вбудованої графіки - на цій системі OpenCL лише ганяв би малі кадри через PCIe
+    USE_OPENCL = False
+    # Сіре + зменшення кадру для OCR на CUDA. Вимкнено: передача всього кадру на GPU
+    # і назад не виміряно як швидшу за зріз зеленого каналу + resize на CPU
+    OCR_ON_GPU = False
     
     # CPU налаштування  
     CPU_THREADS = 12  # i5-13400F має 10 ядер (6P+4E), використовуємо 12 потоків
@@ -37,28 +54,62 @@ class PerformanceConfig:
     SCREENSHOT_SCALE = 0.5  # 50% розміру для економії (1080p -> 540p)
     SCREENSHOT_QUALITY = 70  # JPEG якість (70 = баланс якості/розміру)
     SCREENSHOT_FORMAT = 'JPEG'  # Формат (JPEG замість PNG)
+    PNG_COMPRESSION_LEVEL = 3  # Рівень zlib для PNG (3 - у кілька разів швидше за 6, файл трохи більший)
     
     # OCR оптимізація
     OCR_PREPROCESSING = 'aggressive'  # aggressive/standard/light
+    OCR_DENOISE = 'bilateral'  # Денойзинг у режимі standard: bilateral (швидко) / nlm (fastNlMeans)
     OCR_CACHE_ENABLED = True
     OCR_CACHE_TTL = 3.0  # Кеш на 3 секунди
+    OCR_CACHE_MAX_ENTRIES = 64  # Максимум кадрів у кеші OCR (найстаріші витісняються)
+    OCR_LANGS = 'ukr+rus+eng'  # Мови для постійного Tesseract API
+    # Лише LSTM (--oem 1), без інверсії та словників - швидше на чистому тексті інтерфейсу
+    OCR_TESS_VARIABLES = {
+        'tessedit_do_invert': '0',
+        'load_system_dawg': '0',
+        'load_freq_dawg': '0',
+    }
+    OCR_EARLY_EXIT_CONFIDENCE = 0.8  # Достатня впевненість - інші PSM не пробуємо
+    OCR_MAX_WIDTH = 1200  # Ширші кадри зменшуються перед обробкою (LSTM все одно масштабує рядки)
+    FRAME_DIFF_THRESHOLD = 4  # Макс. різниця пікселя мініатюри 256x144, нижче якої кадр вважається незмінним
+    FRAME_REUSE_MAX = 5  # Після стількох незмінних кадрів поспіль - повний аналіз (застаріле не віддаємо вічно)
+    
+    # Ввід
+    FAST_CLICKS = False  # Клік одним SendInput (рух+натискання+відпускання) без плавного руху миші
     
     # Пам'ять
     MAX_SCREENSHOTS_IN_MEMORY = 5  # Максимум скріншотів в RAM
     CLEANUP_INTERVAL = 300  # Очищення старих скріншотів кожні 5 хв
+    
+    # Логування
+    LOG_FILE_LEVEL = logging.DEBUG  # logging.INFO - DEBUG-повідомлення циклу взагалі не форматуються
+    LOG_TRACEBACKS = False  # Повний traceback у помилках дій (форматується на кожну помилку)
 
 
 # ======================== ДАТА-КЛАСИ ========================
-@dataclass
+# __slots__ для дата-класів доступні з Python 3.10
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ParasiteConfig:
-    """Конфігурація для паразита."""
+    """Конфігурація для паразита (незмінна)."""
     name: str
-    name_variants: List[str]  # Варіанти назв для розпізнавання
+    name_variants: Tuple[str, ...]  # Варіанти назв для розпізнавання
     water_amount: Tuple[float, float]
     duration: int
     key: str
     category: str
     icon_path: str = ""  # Шлях до іконки в data/
+    variants_lower: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    avg_water: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Варіанти в нижньому регістрі - щоб не робити .lower() на кожному кадрі
+        object.__setattr__(self, 'name_variants', tuple(self.name_variants))
+        object.__setattr__(self, 'variants_lower', tuple(v.lower() for v in self.name_variants))
+        # Середній об'єм поливу рахується один раз при завантаженні
+        object.__setattr__(self, 'avg_water', sum(self.water_amount) / 2)
 
 
 @dataclass
@@ -79,21 +130,127 @@ class TaskConfig:
     # Window management
     window_process_name: str = "amazing.exe"
     focus_game_window: bool = True
+    
+    # Сканер назв паразитів (будується один раз при парсингу)
+    parasite_scanner: Optional["ParasiteScanner"] = None
+
+
+def compile_matcher(parasites: Dict[str, ParasiteConfig]) -> Dict[str, Tuple[str, ...]]:
+    """Варіант назви (нижній регістр) -> ключі паразитів, яким він належить."""
+    owners: Dict[str, List[str]] = {}
+    
+    for key, parasite in parasites.items():
+        for variant in parasite.variants_lower:
+            if not variant:
+                continue
+            keys = owners.setdefault(variant, [])
+            if key not in keys:
+                keys.append(key)
+    
+    return {variant: tuple(keys) for variant, keys in owners.items()}
+
+
+class ParasiteScanner:
+    """Пошук усіх варіантів назв паразитів за один лінійний прохід (Aho-Corasick)."""
+    
+    def __init__(self, parasite_variants: Dict[str, Tuple[str, ...]]):
+        self.variants = parasite_variants
+        self._automaton = None
+        
+        if ahocorasick is not None and parasite_variants:
+            automaton = ahocorasick.Automaton()
+            for variant, keys in parasite_variants.items():
+                automaton.add_word(variant, keys)
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    @classmethod
+    def from_parasites(cls, parasites: Dict[str, ParasiteConfig]) -> "ParasiteScanner":
+        """Сканер для словника паразитів з конфігурації."""
+        return cls(compile_matcher(parasites))
+    
+    def scan(self, text: str) -> Set[str]:
+        """Ключі паразитів, варіанти назв яких є в тексті (текст - у нижньому регістрі)."""
+        found = set()
+        
+        if self._automaton is not None:
+            for _, keys in self._automaton.iter(text):
+                found.update(keys)
+        else:
+            for variant, keys in self.variants.items():
+                if variant in text:
+                    found.update(keys)
+        
+        return found
 
 
 # ======================== ПАРСЕР КОНФІГУРАЦІЇ ========================
+# Параметри tasks.txt однією регуляркою. Альтернативи в lookahead не
+# перекривають одна одну: перший збіг групи = перший збіг окремого шаблону
+_CONFIG_VALUES_RE = re.compile(
+    r'(?=вода:\s*(?P<water_min>\d+\.?\d*)\s*-\s*(?P<water_max>\d+\.?\d*)'
+    r'|(?P<fertilizer>\d+\.?\d*)\s*л\s+води\s+з\s+добривом'
+    r'|поливаємо.*?(?P<watering>\d+\.?\d*)\s*літрами'
+    r'|грунт:\s*(?P<soil>\d+))',
+    re.IGNORECASE
+)
+
+# Стандартний tasks.txt, закодований один раз
+_DEFAULT_CONFIG_BYTES = """# Plant Care Bot - Конфігурація завдань
+
+# БАЗОВІ ІНСТРУКЦІЇ:
+# 1) Садимо цибулю
+# 2) Поливаємо кожну цибулю 5 літрами води без добрива
+# 3) На кожну цибулю по 0.95л води з добривом, 1 ходка в 4-6 хвилин
+# 4) Якщо води мало але є паразити - спочатку травимо паразитів
+# 5) Вода: 5-7 літрів. Грунт: 85%.
+# 6) Після паразитів - ОБОВ'ЯЗКОВО поливати БЕЗ добрива
+# 7) Перевіряти рівень води в лейці кожні 5 поливів
+
+# ХІМІКАТИ:
+# Біологічні (2.0-2.4л, 120с): ТЛЯ [2], ГОЛЫЕ СЛИЗНИ [3], КОЛОРАДСКИЙ ЖУК [4]
+# Системні (1.0-1.6л, 80с): ЖУК-ЩЕЛКУН [1], КРАВЧИК-ГОЛОВАЧ [1]
+# Кишкові (4.0-4.7л, 120с): МЕДВЕДКА [5], ПРОВОЛОЧНИК [6], ГАЛЛОВА НЕМАТОДА [7]
+# Контактні (3.0-3.5л, 150с): ТРИПС [8], ПАУТИННЫЙ КЛЕЩ [9]
+
+# АВТОМАТИЗАЦІЯ:
+# Автоходьба: ТАК
+# Автопоповнення води: ТАК
+# Перевірка води кожні N поливів: 5
+""".encode('utf-8')
+
+
 class ConfigParser:
     """Парсер tasks.txt з покращеною логікою."""
     
     @staticmethod
     def parse(file_path: Path) -> TaskConfig:
-        """Парсинг конфігураційного файла."""
-        config = TaskConfig()
-        
+        """Парсинг конфігураційного файла (результат кешується, доки файл не змінено)."""
         if not file_path.exists():
             logging.warning(f"Файл {file_path} не знайдено, створюємо новий")
             ConfigParser._create_default_config(file_path)
         
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        
+        hits = ConfigParser._parse_cached.cache_info().hits
+        cached = ConfigParser._parse_cached(str(file_path), mtime_ns)
+        if ConfigParser._parse_cached.cache_info().hits > hits:
+            logging.info(f"✅ Конфігурацію взято з кешу: {file_path} не змінювався")
+        
+        # Кожен викликач отримує власний екземпляр - кешований не змінюється ззовні
+        # (ParasiteConfig незмінні, тож достатньо копії словника)
+        return replace(cached, parasites=dict(cached.parasites))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _parse_cached(path_str: str, mtime_ns: int) -> TaskConfig:
+        """Власне парсинг; mtime_ns - частина ключа кешу."""
+        file_path = Path(path_str)
+        config = TaskConfig()
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -102,89 +259,92 @@ class ConfigParser:
             parasites_data = {
                 "тля": ParasiteConfig(
                     "ТЛЯ",
-                    ["тля", "тли", "tля", "tli", "aphid", "тл", "тлi"],
+                    ("тля", "тли", "tля", "tli", "aphid", "тл", "тлi"),
                     (2.0, 2.4), 120, "2", "біологічні",
                     icon_path="data/chemicals.png"  # Загальна іконка хімікатів
                 ),
                 "слизни": ParasiteConfig(
                     "ГОЛЫЕ СЛИЗНИ",
-                    ["голые слизни", "слизни", "голі слизні", "слизень", "slug", "slugs", "голi слизнi"],
+                    ("голые слизни", "слизни", "голі слизні", "слизень", "slug", "slugs", "голi слизнi"),
                     (2.0, 2.4), 120, "3", "біологічні",
                     icon_path="data/chemicals.png"
                 ),
                 "колорадський": ParasiteConfig(
                     "КОЛОРАДСКИЙ ЖУК",
-                    ["колорадский жук", "колорадський жук", "жук", "colorado beetle", "beetle", "колорадський"],
+                    ("колорадский жук", "колорадський жук", "жук", "colorado beetle", "beetle", "колорадський"),
                     (2.0, 2.4), 120, "4", "біологічні",
                     icon_path="data/chemicals.png"
                 ),
                 "щелкун": ParasiteConfig(
                     "ЖУК-ЩЕЛКУН",
-                    ["жук-щелкун", "щелкун", "жук щелкун", "click beetle", "щелкун"],
+                    ("жук-щелкун", "щелкун", "жук щелкун", "click beetle", "щелкун"),
                     (1.0, 1.6), 80, "1", "системні",
                     icon_path="data/chemicals.png"
                 ),
                 "кравчик": ParasiteConfig(
                     "КРАВЧИК-ГОЛОВАЧ",
-                    ["кравчик-головач", "кравчик", "головач", "kravchyk", "кравчик"],
+                    ("кравчик-головач", "кравчик", "головач", "kravchyk", "кравчик"),
                     (1.0, 1.6), 80, "1", "системні",
                     icon_path="data/chemicals.png"
                 ),
                 "медведка": ParasiteConfig(
                     "МЕДВЕДКА",
-                    ["медведка", "медведь", "mole cricket", "медвiдка"],
+                    ("медведка", "медведь", "mole cricket", "медвiдка"),
                     (4.0, 4.7), 120, "5", "кишкові",
                     icon_path="data/chemicals.png"
                 ),
                 "проволочник": ParasiteConfig(
                     "ПРОВОЛОЧНИК",
-                    ["проволочник", "проволочник", "wireworm", "проволочнiк"],
+                    ("проволочник", "проволочник", "wireworm", "проволочнiк"),
                     (4.0, 4.7), 120, "6", "кишкові",
                     icon_path="data/chemicals.png"
                 ),
                 "нематода": ParasiteConfig(
                     "ГАЛЛОВА НЕМАТОДА",
-                    ["нематода", "галлова нематода", "галова", "nematode", "галлова", "нематода"],
+                    ("нематода", "галлова нематода", "галова", "nematode", "галлова", "нематода"),
                     (4.0, 4.7), 120, "7", "кишкові",
                     icon_path="data/chemicals.png"
                 ),
                 "трипс": ParasiteConfig(
                     "ТРИПС",
-                    ["трипс", "трипси", "thrips", "трiпс"],
+                    ("трипс", "трипси", "thrips", "трiпс"),
                     (3.0, 3.5), 150, "8", "контактні",
                     icon_path="data/chemicals.png"
                 ),
                 "клещ": ParasiteConfig(
                     "ПАУТИННЫЙ КЛЕЩ",
-                    ["паутинный клещ", "павутинний кліщ", "клещ", "кліщ", "spider mite", "mite", "павутинний"],
+                    ("паутинный клещ", "павутинний кліщ", "клещ", "кліщ", "spider mite", "mite", "павутинний"),
                     (3.0, 3.5), 150, "9", "контактні",
                     icon_path="data/chemicals.png"
                 ),
             }
             
             config.parasites = parasites_data
+            config.parasite_scanner = ParasiteScanner.from_parasites(parasites_data)
             
-            # Парсинг параметрів з файлу
-            content_lower = content.lower()
+            # Парсинг параметрів з файлу (один прохід, перший збіг кожного параметра)
+            first_matches = {}
+            for match in _CONFIG_VALUES_RE.finditer(content):
+                first_matches.setdefault(match.lastgroup, match)
             
-            water_match = re.search(r'вода:\s*(\d+\.?\d*)\s*-\s*(\d+\.?\d*)', content_lower)
+            water_match = first_matches.get('water_max')
             if water_match:
-                config.water_range = (float(water_match.group(1)), float(water_match.group(2)))
+                config.water_range = (float(water_match.group('water_min')), float(water_match.group('water_max')))
                 logging.info(f"📌 Діапазон води: {config.water_range[0]}-{config.water_range[1]}л")
             
-            fertilizer_match = re.search(r'(\d+\.?\d*)\s*л\s+води\s+з\s+добривом', content_lower)
+            fertilizer_match = first_matches.get('fertilizer')
             if fertilizer_match:
-                config.fertilizer_amount = float(fertilizer_match.group(1))
+                config.fertilizer_amount = float(fertilizer_match.group('fertilizer'))
                 logging.info(f"📌 Кількість з добривом: {config.fertilizer_amount}л")
             
-            watering_match = re.search(r'поливаємо.*?(\d+\.?\d*)\s*літрами', content_lower)
+            watering_match = first_matches.get('watering')
             if watering_match:
-                config.watering_amount = float(watering_match.group(1))
+                config.watering_amount = float(watering_match.group('watering'))
                 logging.info(f"📌 Базовий полив: {config.watering_amount}л")
             
-            soil_match = re.search(r'грунт:\s*(\d+)', content_lower)
+            soil_match = first_matches.get('soil')
             if soil_match:
-                config.soil_percentage = int(soil_match.group(1))
+                config.soil_percentage = int(soil_match.group('soil'))
                 logging.info(f"📌 Грунт: {config.soil_percentage}%")
             
             logging.info(f"✅ Конфігурацію завантажено: {len(config.parasites)} паразитів")
@@ -197,37 +357,24 @@ class ConfigParser:
     @staticmethod
     def _create_default_config(file_path: Path):
         """Створення стандартного конфігураційного файла."""
-        default_config = """# Plant Care Bot - Конфігурація завдань
-
-# БАЗОВІ ІНСТРУКЦІЇ:
-# 1) Садимо цибулю
-# 2) Поливаємо кожну цибулю 5 літрами води без добрива
-# 3) На кожну цибулю по 0.95л води з добривом, 1 ходка в 4-6 хвилин
-# 4) Якщо води мало але є паразити - спочатку травимо паразитів
-# 5) Вода: 5-7 літрів. Грунт: 85%.
-# 6) Після паразитів - ОБОВ'ЯЗКОВО поливати БЕЗ добрива
-# 7) Перевіряти рівень води в лейці кожні 5 поливів
-
-# ХІМІКАТИ:
-# Біологічні (2.0-2.4л, 120с): ТЛЯ [2], ГОЛЫЕ СЛИЗНИ [3], КОЛОРАДСКИЙ ЖУК [4]
-# Системні (1.0-1.6л, 80с): ЖУК-ЩЕЛКУН [1], КРАВЧИК-ГОЛОВАЧ [1]
-# Кишкові (4.0-4.7л, 120с): МЕДВЕДКА [5], ПРОВОЛОЧНИК [6], ГАЛЛОВА НЕМАТОДА [7]
-# Контактні (3.0-3.5л, 150с): ТРИПС [8], ПАУТИННЫЙ КЛЕЩ [9]
-
-# АВТОМАТИЗАЦІЯ:
-# Автоходьба: ТАК
-# Автопоповнення води: ТАК
-# Перевірка води кожні N поливів: 5
-"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(default_config)
+            file_path.write_bytes(_DEFAULT_CONFIG_BYTES)
             logging.info(f"✅ Створено стандартний конфіг: {file_path}")
         except Exception as e:
             logging.error(f"❌ Помилка створення конфігу: {e}")
 
 
 # ======================== ЛОГУВАННЯ ========================
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def flush_logging():
+    """Дочекатися запису всіх логів з черги (фоновий потік продовжує роботу)."""
+    if _log_listener is not None:
+        _log_listener.stop()  # Зливає чергу і зупиняє потік
+        _log_listener.start()
+
+
 def setup_enhanced_logging(level=logging.INFO):
     """Покращене логування з кольорами та деталями."""
     
@@ -244,52 +391,75 @@ def setup_enhanced_logging(level=logging.INFO):
             'RESET': '\033[0m'
         }
         
-        def format(self, record):
-            # Додаємо емодзі для швидкої ідентифікації
-            emoji_map = {
-                'DEBUG': '🔧',
-                'INFO': 'ℹ️',
-                'WARNING': '⚠️',
-                'ERROR': '❌',
-                'CRITICAL': '🚨'
+        # Емодзі для швидкої ідентифікації
+        EMOJIS = {
+            'DEBUG': '🔧',
+            'INFO': 'ℹ️',
+            'WARNING': '⚠️',
+            'ERROR': '❌',
+            'CRITICAL': '🚨'
+        }
+        
+        def __init__(self):
+            super().__init__(datefmt='%H:%M:%S')
+            # Готовий %-шаблон на кожен рівень - без f-string на кожен запис
+            self._templates = {
+                level: f"{color}{self.EMOJIS[level]} [%(asctime)s] {level:8s} "
+                       f"[%(module)s:%(lineno)d] %(message)s{self.COLORS['RESET']}"
+                for level, color in self.COLORS.items() if level in self.EMOJIS
             }
-            
-            color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-            emoji = emoji_map.get(record.levelname, '•')
-            
-            # Форматування часу
-            record.asctime = self.formatTime(record, '%H:%M:%S')
-            
-            # Додаємо інформацію про модуль
-            module_info = f"{record.module}:{record.lineno}"
-            
-            formatted = f"{color}{emoji} [{record.asctime}] {record.levelname:8s} [{module_info}] {record.getMessage()}{self.COLORS['RESET']}"
-            
-            return formatted
+            self._default_template = (
+                f"{self.COLORS['RESET']}• [%(asctime)s] %(levelname)-8s "
+                f"[%(module)s:%(lineno)d] %(message)s{self.COLORS['RESET']}"
+            )
+        
+        def format(self, record):
+            record.message = record.getMessage()
+            record.asctime = self.formatTime(record, self.datefmt)
+            return self.formatMessage(record)
+        
+        def formatMessage(self, record):
+            template = self._templates.get(record.levelname, self._default_template)
+            return template % record.__dict__
+    
+    global _log_listener
     
     # Налаштування хендлерів
     from datetime import datetime
     log_file = LOGS_DIR / f"bot_{datetime.now().strftime('%Y%m%d')}.log"
     
-    # Консольний хендлер з кольорами
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_handler.setFormatter(ColoredFormatter())
-    
-    # Файловий хендлер (без кольорів)
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)  # Файл завжди DEBUG
-    file_formatter = logging.Formatter(
-        '%(asctime)s [%(levelname)s] [%(module)s:%(lineno)d] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(file_formatter)
-    
-    # Базове налаштування
-    logging.basicConfig(
-        level=logging.DEBUG,
-        handlers=[console_handler, file_handler]
-    )
+    if _log_listener is None:
+        # Консольний хендлер з кольорами
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(level)
+        console_handler.setFormatter(ColoredFormatter())
+        
+        # Файловий хендлер (без кольорів)
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(PerformanceConfig.LOG_FILE_LEVEL)
+        file_formatter = logging.Formatter(
+            '%(asctime)s [%(levelname)s] [%(module)s:%(lineno)d] %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        file_handler.setFormatter(file_formatter)
+        
+        # Запис на диск і в консоль - у фоновому потоці, виклики logging.* лише кладуть запис у чергу
+        log_queue = queue.Queue(-1)
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        
+        # Остаточне форматування робить хендлер у фоновому потоці
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        # Базове налаштування
+        logging.basicConfig(
+            level=min(level, PerformanceConfig.LOG_FILE_LEVEL),
+            handlers=[queue_handler]
+        )
     
     logging.info("=" * 80)
     logging.info("🌱 Plant Care Bot v2.1 - ENHANCED EDITION")
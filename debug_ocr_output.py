@@ -2,10 +2,24 @@
 debug_ocr_output.py - Дебаг скрипт для перегляду що саме бачить бот
 
 Запуск: python debug_ocr_output.py
+        python debug_ocr_output.py --frames 20   # безперервний аналіз 20 кадрів
+        python debug_ocr_output.py screenshots/*.jpg   # пакетний аналіз збережених скріншотів
 """
+import io
+import os
+import re
+import sys
 import time
 import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
 
 from config import TaskConfig, setup_enhanced_logging
 from analyzer import SmartAnalyzer
@@ -15,7 +29,124 @@ from performance_optimizer import PerformanceOptimizer
 # Налаштування логування
 setup_enhanced_logging(level=logging.INFO)
 
+# Ключові слова для ручного пошуку (один прохід регулярки по тексту, без копії .lower())
+PARASITE_KEYWORDS = {
+    'тля': 'ТЛЯ',
+    'слизни': 'ГОЛЫЕ СЛИЗНИ',
+    'колорадский': 'КОЛОРАДСКИЙ ЖУК',
+    'щелкун': 'ЖУК-ЩЕЛКУН',
+    'кравчик': 'КРАВЧИК-ГОЛОВАЧ',
+    'медведка': 'МЕДВЕДКА',
+    'проволочник': 'ПРОВОЛОЧНИК',
+    'нематода': 'ГАЛЛОВА НЕМАТОДА',
+    'трипс': 'ТРИПС',
+    'клещ': 'ПАУТИННЫЙ КЛЕЩ',
+}
+WATER_KEYWORDS = ['вода', 'води', 'полив', 'налити', 'літр', 'water']
+
+_PARASITE_RE = re.compile('|'.join(map(re.escape, PARASITE_KEYWORDS)), re.IGNORECASE)
+_WATER_RE = re.compile('|'.join(map(re.escape, WATER_KEYWORDS)), re.IGNORECASE)
+
+# Статичні заголовки звіту - збираються один раз
+_RULE = "=" * 80
+_SEP = "-" * 80
+_HEADER_RESULTS = f"\n{_RULE}\n📊 РЕЗУЛЬТАТИ АНАЛІЗУ:\n{_RULE}"
+_HEADER_PARASITES = f"\n🐛 ПАРАЗИТИ:\n{_SEP}"
+_HEADER_WATER = f"\n💧 ВОДА:\n{_SEP}"
+_HEADER_FERTILIZER = f"\n🌱 ДОБРИВО:\n{_SEP}"
+_HEADER_UI = f"\n🎮 UI ЕЛЕМЕНТИ:\n{_SEP}"
+_HEADER_SUMMARY = f"\n{_RULE}\n📊 ПІДСУМОК:\n{_RULE}"
+_HEADER_RECOMMENDATIONS = f"\n{_RULE}\n💡 РЕКОМЕНДАЦІЇ:\n{_RULE}"
+_FOOTER_DONE = f"\n{_RULE}\n✅ Дебаг завершено!\n{_RULE}"
+
+
+def first_positions(pattern: re.Pattern, text: str) -> dict:
+    """Позиція першого входження кожного ключового слова - за один прохід."""
+    positions = {}
+    for match in pattern.finditer(text):
+        positions.setdefault(match.group().lower(), match.start())
+    return positions
+
+
+def watch_frames(analyzer: SmartAnalyzer, count: int):
+    """Безперервний аналіз count кадрів конвеєром.
+    
+    Наступний кадр захоплюється в окремому потоці, поки йде OCR поточного
+    (Tesseract відпускає GIL). Два буфери кадру чергуються: в один пише
+    захоплення, з іншого читає OCR. Усі кадри захоплює один потік 'capture' -
+    дескриптор mss аналізатора прив'язаний до потоку, тож створюється лише там.
+    """
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture') as capture_pool:
+        frame = capture_pool.submit(analyzer.capture_screen).result()
+        if frame is None:
+            print("❌ Не вдалося захопити екран")
+            return
+        
+        views = [memoryview(bytearray(frame.nbytes)) for _ in range(2)]
+        for i in range(count):
+            next_frame = None
+            if i + 1 < count:
+                next_frame = capture_pool.submit(analyzer.capture_screen, views[i % 2])
+            
+            analysis = analyzer.analyze_screen(save_screenshot=False, frame=frame)
+            parasites = ', '.join(p.name for p in analysis.parasites_found) or '-'
+            print(f"🎞️ Кадр {i + 1}/{count}: {analysis.analysis_time * 1000:.0f} мс, "
+                  f"OCR {analysis.text_confidence:.0%}, паразити: {parasites}")
+            
+            if next_frame is None:
+                break
+            frame = next_frame.result()
+            if frame is None:
+                print("❌ Не вдалося захопити екран")
+                break
+
+
+# ====== ПАКЕТНИЙ АНАЛІЗ ======
+# Один аналізатор (і один однопотоковий Tesseract) на процес
+_worker_analyzer: Optional[SmartAnalyzer] = None
+
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = SmartAnalyzer(config=TaskConfig(), tess_api=SmartAnalyzer.create_tess_api())
+
+
+def analyze_one(path: str) -> Tuple[str, float, float, List[str]]:
+    """Аналіз збереженого скріншоту в процесі-воркері."""
+    # imdecode замість imread - шляхи з кирилицею на Windows
+    frame = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return path, 0.0, 0.0, []
+    
+    analysis = _worker_analyzer.analyze_screen(save_screenshot=False, frame=frame)
+    return path, analysis.analysis_time, analysis.text_confidence, [p.name for p in analysis.parasites_found]
+
+
+def analyze_batch(paths: List[str]):
+    """Пакетний аналіз скріншотів: по процесу з Tesseract на кожне ядро."""
+    workers = min(os.cpu_count() or 1, len(paths))
+    print(f"📂 Пакетний аналіз {len(paths)} скріншотів ({workers} процесів)...")
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+        for path, analysis_time, confidence, parasites in ex.map(analyze_one, paths):
+            print(f"  {Path(path).name}: {analysis_time * 1000:.0f} мс, OCR {confidence:.0%}, "
+                  f"паразити: {', '.join(parasites) or '-'}")
+    print(f"✅ Готово за {time.perf_counter() - start:.1f} с")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Дебаг: що бачить бот")
+    parser.add_argument('paths', nargs='*',
+                        help="збережені скріншоти для пакетного аналізу (замість захоплення екрану)")
+    parser.add_argument('--frames', type=int, default=0,
+                        help="безперервний аналіз N кадрів замість одного звіту")
+    args = parser.parse_args()
+    
+    if args.paths:
+        analyze_batch(args.paths)
+        return
+    
     print("\n" + "="*80)
     print("🔍 DEBUG: Що бачить бот?")
     print("="*80 + "\n")
@@ -33,12 +164,24 @@ def main():
     else:
         print("⚠️ Вікно гри не знайдено, працюємо на всьому екрані")
     
+    # Постійний Tesseract API на всі кадри (None - тоді pytesseract)
+    tess_api = SmartAnalyzer.create_tess_api()
     analyzer = SmartAnalyzer(
         config=config,
         window_manager=window_manager,
-        performance_optimizer=perf_optimizer
+        performance_optimizer=perf_optimizer,
+        tess_api=tess_api
     )
-    
+    try:
+        run_analysis(analyzer, args.frames)
+    finally:
+        analyzer.close()
+        if tess_api is not None:
+            tess_api.End()
+
+
+def run_analysis(analyzer: SmartAnalyzer, frames: int):
+    """Аналіз і звіт (або безперервний аналіз frames кадрів)."""
     # Автовиявлення області
     analyzer.auto_detect_game_ui()
     
@@ -46,168 +189,160 @@ def main():
     print("📍 Переконайся що гра відкрита і на екрані видно текст\n")
     time.sleep(2)
     
+    if frames > 0:
+        watch_frames(analyzer, frames)
+        analyzer.log_stats()
+        return
+    
     # Аналіз
     print("📸 Захоплення екрану...")
     analysis = analyzer.analyze_screen(save_screenshot=True)
     
-    print("\n" + "="*80)
-    print("📊 РЕЗУЛЬТАТИ АНАЛІЗУ:")
-    print("="*80)
+    # Звіт збирається в буфер і виводиться одним записом
+    buffer = io.StringIO()
+    report = partial(print, file=buffer)
+    
+    report(_HEADER_RESULTS)
     
     # Основна інформація
-    print(f"\n📝 OCR впевненість: {analysis.text_confidence:.1%}")
-    print(f"🎯 Загальна впевненість: {analysis.confidence:.1%}")
-    print(f"📱 Тип екрану: {analysis.current_screen}")
+    report(f"\n📝 OCR впевненість: {analysis.text_confidence:.1%}")
+    report(f"🎯 Загальна впевненість: {analysis.confidence:.1%}")
+    report(f"📱 Тип екрану: {analysis.current_screen}")
     
     # Розпізнаний текст
-    print(f"\n📄 РОЗПІЗНАНИЙ ТЕКСТ ({len(analysis.text)} символів):")
-    print("-" * 80)
+    report(f"\n📄 РОЗПІЗНАНИЙ ТЕКСТ ({len(analysis.text)} символів):")
+    report(_SEP)
     if analysis.text:
         # Показуємо перші 500 символів
         preview = analysis.text[:500]
-        print(preview)
+        report(preview)
         if len(analysis.text) > 500:
-            print(f"\n... (ще {len(analysis.text) - 500} символів)")
+            report(f"\n... (ще {len(analysis.text) - 500} символів)")
     else:
-        print("⚠️ ТЕКСТ НЕ РОЗПІЗНАНО!")
+        report("⚠️ ТЕКСТ НЕ РОЗПІЗНАНО!")
     
     # По рядках
     if analysis.text_lines:
-        print(f"\n📋 РЯДКИ ТЕКСТУ ({len(analysis.text_lines)} шт):")
-        print("-" * 80)
-        for i, line in enumerate(analysis.text_lines[:20], 1):  # Перші 20
-            if line.strip():
-                print(f"{i:2d}. {line[:70]}")
+        report(f"\n📋 РЯДКИ ТЕКСТУ ({len(analysis.text_lines)} шт):")
+        report(_SEP)
+        # Перші 20 рядків (порожні пропускаються, нумерація - як у тексті) одним блоком
+        block = "\n".join(f"{i:2d}. {line[:70]}"
+                          for i, line in enumerate(islice(analysis.text_lines, 20), 1)
+                          if line.strip())
+        if block:
+            report(block)
         if len(analysis.text_lines) > 20:
-            print(f"... (ще {len(analysis.text_lines) - 20} рядків)")
+            report(f"... (ще {len(analysis.text_lines) - 20} рядків)")
     
     # Пошук паразитів
-    print(f"\n🐛 ПАРАЗИТИ:")
-    print("-" * 80)
+    report(_HEADER_PARASITES)
     if analysis.parasites_found:
         for p in analysis.parasites_found:
-            print(f"  ✅ {p.name} (клавіша: {p.key}, категорія: {p.category})")
+            report(f"  ✅ {p.name} (клавіша: {p.key}, категорія: {p.category})")
     else:
-        print("  ❌ Паразитів не виявлено")
+        report("  ❌ Паразитів не виявлено")
         
         # Спробуємо знайти вручну
-        text_lower = analysis.text.lower()
-        print("\n  🔍 Ручний пошук паразитів в тексті:")
-        
-        parasite_keywords = {
-            'тля': 'ТЛЯ',
-            'слизни': 'ГОЛЫЕ СЛИЗНИ',
-            'колорадский': 'КОЛОРАДСКИЙ ЖУК',
-            'щелкун': 'ЖУК-ЩЕЛКУН',
-            'кравчик': 'КРАВЧИК-ГОЛОВАЧ',
-            'медведка': 'МЕДВЕДКА',
-            'проволочник': 'ПРОВОЛОЧНИК',
-            'нематода': 'ГАЛЛОВА НЕМАТОДА',
-            'трипс': 'ТРИПС',
-            'клещ': 'ПАУТИННЫЙ КЛЕЩ',
-        }
+        text = analysis.text
+        report("\n  🔍 Ручний пошук паразитів в тексті:")
         
+        positions = first_positions(_PARASITE_RE, text)
         found_manual = []
-        for keyword, name in parasite_keywords.items():
-            if keyword in text_lower:
+        for keyword, name in PARASITE_KEYWORDS.items():
+            if keyword in positions:
                 found_manual.append(name)
                 # Знайти контекст
-                idx = text_lower.find(keyword)
-                context_start = max(0, idx - 20)
-                context_end = min(len(text_lower), idx + len(keyword) + 20)
-                context = analysis.text[context_start:context_end]
-                print(f"    • '{keyword}' → {name}")
-                print(f"      Контекст: ...{context}...")
+                idx = positions[keyword]
+                context = text[max(0, idx - 20):idx + len(keyword) + 20]
+                report(f"    • '{keyword}' → {name}")
+                report(f"      Контекст: ...{context}...")
         
         if not found_manual:
-            print("    ❌ Жодного ключового слова не знайдено")
+            report("    ❌ Жодного ключового слова не знайдено")
     
     # Вода
-    print(f"\n💧 ВОДА:")
-    print("-" * 80)
+    report(_HEADER_WATER)
     if analysis.water_level_low:
-        print(f"  ⚠️ НИЗЬКИЙ РІВЕНЬ")
+        report(f"  ⚠️ НИЗЬКИЙ РІВЕНЬ")
         if analysis.water_amount_needed:
-            print(f"  📊 Потрібно: {analysis.water_amount_needed:.1f}л")
+            report(f"  📊 Потрібно: {analysis.water_amount_needed:.1f}л")
     else:
-        print("  ✅ Рівень нормальний")
+        report("  ✅ Рівень нормальний")
         
         # Ручний пошук
-        text_lower = analysis.text.lower()
-        water_keywords = ['вода', 'води', 'полив', 'налити', 'літр', 'water']
-        found_water = [kw for kw in water_keywords if kw in text_lower]
+        water_positions = first_positions(_WATER_RE, analysis.text)
+        found_water = [kw for kw in WATER_KEYWORDS if kw in water_positions]
         
         if found_water:
-            print(f"  🔍 Знайдені слова про воду: {', '.join(found_water)}")
+            report(f"  🔍 Знайдені слова про воду: {', '.join(found_water)}")
         else:
-            print("  ❌ Слів про воду не знайдено")
+            report("  ❌ Слів про воду не знайдено")
     
     # Добриво
-    print(f"\n🌱 ДОБРИВО:")
-    print("-" * 80)
+    report(_HEADER_FERTILIZER)
     if analysis.needs_fertilizer:
-        print("  ✅ Потрібне")
+        report("  ✅ Потрібне")
     else:
-        print("  ❌ Не потрібне")
+        report("  ❌ Не потрібне")
     
     # Грунт
     if analysis.soil_level:
-        print(f"\n🌍 ГРУНТ: {analysis.soil_level}%")
+        report(f"\n🌍 ГРУНТ: {analysis.soil_level}%")
     
     # UI елементи
     if analysis.ui_elements_detected:
-        print(f"\n🎮 UI ЕЛЕМЕНТИ:")
-        print("-" * 80)
+        report(_HEADER_UI)
         for elem in analysis.ui_elements_detected:
-            print(f"  • {elem}")
+            report(f"  • {elem}")
     
     # Скріншот
     if analysis.screenshot_path:
-        print(f"\n📸 СКРІНШОТ: {analysis.screenshot_path}")
-        print(f"   Розмір файлу: {analysis.screenshot_path.stat().st_size / 1024:.1f} KB")
+        analyzer.flush_screenshots()  # Скріншот пишеться у фоні
+        report(f"\n📸 СКРІНШОТ: {analysis.screenshot_path}")
+        if analysis.screenshot_size is not None:
+            report(f"   Розмір файлу: {analysis.screenshot_size / 1024:.1f} KB")
     
     # Підсумок
-    print("\n" + "="*80)
-    print("📊 ПІДСУМОК:")
-    print("="*80)
-    print(analysis.get_summary())
+    report(_HEADER_SUMMARY)
+    report(analysis.get_summary())
     
     # Рекомендації
-    print("\n" + "="*80)
-    print("💡 РЕКОМЕНДАЦІЇ:")
-    print("="*80)
+    report(_HEADER_RECOMMENDATIONS)
     
     if analysis.text_confidence < 0.5:
-        print("⚠️ НИЗЬКА ЯКІСТЬ OCR (<50%):")
-        print("  1. Перевір чи на екрані видно текст (не меню, не чорний екран)")
-        print("  2. Збільш шрифт в грі (якщо є налаштування)")
-        print("  3. Перевір роздільність гри (мінімум 1080p)")
-        print("  4. Встанови мовні пакети Tesseract: ukr, rus, eng")
+        report("⚠️ НИЗЬКА ЯКІСТЬ OCR (<50%):")
+        report("  1. Перевір чи на екрані видно текст (не меню, не чорний екран)")
+        report("  2. Збільш шрифт в грі (якщо є налаштування)")
+        report("  3. Перевір роздільність гри (мінімум 1080p)")
+        report("  4. Встанови мовні пакети Tesseract: ukr, rus, eng")
     
     if not analysis.parasites_found and analysis.text_confidence > 0.5:
-        print("⚠️ ТЕКСТ РОЗПІЗНАЄТЬСЯ, АЛЕ ПАРАЗИТИ НЕ ЗНАЙДЕНІ:")
-        print("  1. Можливо на екрані немає паразитів (це нормально)")
-        print("  2. Перевір чи правильно написані назви в tasks.txt")
-        print("  3. Подивись 'РУЧНИЙ ПОШУК' вище - чи є схожі слова?")
+        report("⚠️ ТЕКСТ РОЗПІЗНАЄТЬСЯ, АЛЕ ПАРАЗИТИ НЕ ЗНАЙДЕНІ:")
+        report("  1. Можливо на екрані немає паразитів (це нормально)")
+        report("  2. Перевір чи правильно написані назви в tasks.txt")
+        report("  3. Подивись 'РУЧНИЙ ПОШУК' вище - чи є схожі слова?")
     
     if analysis.confidence < 0.3:
-        print("⚠️ ЗАГАЛЬНА ВПЕВНЕНІСТЬ ДУЖЕ НИЗЬКА (<30%):")
-        print("  1. Можливо захоплюється не та область екрану")
-        print("  2. Спробуй встановити область вручну через GUI")
-        print("  3. Перевір скріншот - чи на ньому гра чи щось інше")
+        report("⚠️ ЗАГАЛЬНА ВПЕВНЕНІСТЬ ДУЖЕ НИЗЬКА (<30%):")
+        report("  1. Можливо захоплюється не та область екрану")
+        report("  2. Спробуй встановити область вручну через GUI")
+        report("  3. Перевір скріншот - чи на ньому гра чи щось інше")
     
-    print("\n" + "="*80)
-    print("✅ Дебаг завершено!")
-    print("="*80)
+    report(_FOOTER_DONE)
     
     # Статистика аналізатора
-    print("\n📊 Статистика аналізатора:")
+    report("\n📊 Статистика аналізатора:")
     stats = analyzer.get_stats()
     for key, value in stats.items():
         if isinstance(value, (int, float)):
-            print(f"   {key}: {value}")
+            report(f"   {key}: {value}")
         else:
-            print(f"   {key}: {value}")
+            report(f"   {key}: {value}")
+    
+    # Увесь звіт - одним записом у консоль
+    sys.stdout.write(buffer.getvalue())
+    sys.stdout.flush()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
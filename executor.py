@@ -5,11 +5,14 @@ import time
 import logging
 from typing import Optional, Tuple
 from enum import Enum
+from dataclasses import dataclass, asdict
 
 import pyautogui
+import win32con
 
-from config import ParasiteConfig
+from config import ParasiteConfig, PerformanceConfig, DATACLASS_SLOTS
 from analyzer import SmartAnalyzer, ScreenAnalysis
+from window_manager import send_click, send_key_presses
 
 
 # ======================== СТАНИ ВИКОНАННЯ ========================
@@ -25,6 +28,31 @@ class ExecutionState(Enum):
     ERROR = "error"
 
 
+@dataclass(**DATACLASS_SLOTS)
+class ExecutorStats:
+    """Лічильники виконавця (атрибути замість ключів словника)."""
+    parasites_treated: int = 0
+    waterings_performed: int = 0
+    water_refills: int = 0
+    failed_actions: int = 0
+    total_actions: int = 0
+
+
+# Звіт статистики - один шаблон, один запис у лог
+_STATS_TEMPLATE = "\n".join([
+    "=" * 80,
+    "📊 СТАТИСТИКА ВИКОНАВЦЯ:",
+    "   🐛 Паразитів оброблено: {parasites_treated}",
+    "   💧 Поливів виконано: {waterings_performed}",
+    "   🚰 Поповнень води: {water_refills}",
+    "   ❌ Невдалих дій: {failed_actions}",
+    "   ✅ Всього дій: {total_actions}",
+    "   📍 Точка поливу: {watering_point}",
+    "   🔄 Наступна перевірка води через: {remaining} поливів",
+    "=" * 80,
+])
+
+
 # ======================== РОЗУМНИЙ ВИКОНАВЕЦЬ ========================
 class SmartExecutor:
     """Виконавець з автономністю та розумінням контексту."""
@@ -37,7 +65,8 @@ class SmartExecutor:
         # Налаштування
         self.watering_point: Optional[Tuple[int, int]] = None
         self.action_delay = 0.5
-        self.typing_delay = 0.1
+        self.typing_delay = 0.0  # Пауза між символами (збільшити, якщо гра пропускає натискання)
+        self.clear_presses = 8  # Кількість backspace для очищення поля кількості
         
         # Стан
         self.current_state = ExecutionState.IDLE
@@ -46,16 +75,14 @@ class SmartExecutor:
         # Лічильники для автоматизації
         self.watering_count = 0
         self.water_check_interval = 5  # Перевірка води кожні 5 поливів
-        self.last_parasite_treatment = 0
+        self._no_fertilizer_until_ns = 0  # Після паразитів - полив без добрива (time.monotonic_ns)
         
         # Статистика
-        self.stats = {
-            'parasites_treated': 0,
-            'waterings_performed': 0,
-            'water_refills': 0,
-            'failed_actions': 0,
-            'total_actions': 0,
-        }
+        self.stats = ExecutorStats()
+        
+        # Блок логу обробки для кожного паразита - збирається один раз
+        self._treatment_banners = {p.name: self._treatment_banner(p)
+                                   for p in analyzer.config.parasites.values()}
         
         logging.info("⚡ Ініціалізовано Smart Executor")
     
@@ -69,7 +96,8 @@ class SmartExecutor:
         3. Якщо паразитів немає - звичайний полив (з добривом за потреби)
         4. Кожні 5 поливів - перевірка рівня води в лейці
         """
-        if analysis.confidence < 0.3:
+        # Порожній кадр або низька впевненість - вихід до будь-якої обробки
+        if not analysis.text or analysis.confidence < 0.3:
             logging.debug(f"⭐ Пропуск (низька впевненість: {analysis.confidence:.1%})")
             return False
         
@@ -87,12 +115,12 @@ class SmartExecutor:
                     
                     if self._handle_parasite_smart(parasite):
                         executed = True
-                        self.stats['parasites_treated'] += 1
-                        self.stats['total_actions'] += 1
-                        self.last_parasite_treatment = time.time()
+                        self.stats.parasites_treated += 1
+                        self.stats.total_actions += 1
+                        self._no_fertilizer_until_ns = time.monotonic_ns() + 10_000_000_000
                         time.sleep(self.action_delay)
                     else:
-                        self.stats['failed_actions'] += 1
+                        self.stats.failed_actions += 1
                 else:
                     logging.debug(f"⏳ Cooldown для {parasite.name}")
         
@@ -107,7 +135,7 @@ class SmartExecutor:
                 water_amount = analysis.water_amount_needed or self.analyzer.config.watering_amount
                 
                 # Якщо були паразити недавно (останні 10 сек) - БЕЗ добрива
-                recently_treated = (time.time() - self.last_parasite_treatment) < 10
+                recently_treated = time.monotonic_ns() < self._no_fertilizer_until_ns
                 use_fertilizer = analysis.needs_fertilizer and not recently_treated
                 
                 if recently_treated:
@@ -117,11 +145,11 @@ class SmartExecutor:
                 
                 if self._water_plant_smart(water_amount, use_fertilizer):
                     executed = True
-                    self.stats['waterings_performed'] += 1
-                    self.stats['total_actions'] += 1
+                    self.stats.waterings_performed += 1
+                    self.stats.total_actions += 1
                     self.watering_count += 1
                 else:
-                    self.stats['failed_actions'] += 1
+                    self.stats.failed_actions += 1
         
         # Перевірка лейки кожні N поливів
         if self.watering_count > 0 and self.watering_count % self.water_check_interval == 0:
@@ -133,6 +161,15 @@ class SmartExecutor:
         
         return executed
     
+    @staticmethod
+    def _treatment_banner(parasite: ParasiteConfig) -> str:
+        """Опис паразита для логу обробки."""
+        return (f"🧪 Обробка паразита: {parasite.name}\n"
+                f"   ├─ Категорія: {parasite.category}\n"
+                f"   ├─ Клавіша: {parasite.key}\n"
+                f"   ├─ Об'єм: {parasite.water_amount[0]}-{parasite.water_amount[1]}л\n"
+                f"   └─ Тривалість: {parasite.duration}с")
+    
     def _handle_parasite_smart(self, parasite: ParasiteConfig) -> bool:
         """
         Розумна обробка паразита з пошуком в інвентарі.
@@ -144,11 +181,8 @@ class SmartExecutor:
         4. Застосування
         """
         try:
-            logging.info(f"🧪 Обробка паразита: {parasite.name}")
-            logging.info(f"   ├─ Категорія: {parasite.category}")
-            logging.info(f"   ├─ Клавіша: {parasite.key}")
-            logging.info(f"   ├─ Об'єм: {parasite.water_amount[0]}-{parasite.water_amount[1]}л")
-            logging.info(f"   └─ Тривалість: {parasite.duration}с")
+            banner = self._treatment_banners.get(parasite.name)
+            logging.info(banner if banner is not None else self._treatment_banner(parasite))
             
             # Фокус на вікно
             if self.window_manager:
@@ -169,7 +203,7 @@ class SmartExecutor:
             time.sleep(0.5)
             
             # Встановлення кількості
-            avg_amount = sum(parasite.water_amount) / 2
+            avg_amount = parasite.avg_water
             self._set_amount(avg_amount)
             
             logging.info(f"✅ Паразита {parasite.name} оброблено ({avg_amount:.1f}л)")
@@ -181,7 +215,7 @@ class SmartExecutor:
             return True
             
         except Exception as e:
-            logging.error(f"❌ Помилка обробки паразита {parasite.name}: {e}", exc_info=True)
+            logging.error(f"❌ Помилка обробки паразита {parasite.name}: {e}", exc_info=PerformanceConfig.LOG_TRACEBACKS)
             return False
     
     def _try_quick_chemical(self, parasite: ParasiteConfig) -> bool:
@@ -231,12 +265,12 @@ class SmartExecutor:
                 x, y = self.watering_point
                 logging.info(f"   └─ Клік на точку: ({x}, {y})")
                 
+                # Плавний рух миші не потрібен - курсор переноситься миттєво
                 if self.window_manager:
-                    self.window_manager.click_in_window(x, y, window_coords=False)
-                else:
-                    pyautogui.moveTo(x, y, duration=0.2)
-                    time.sleep(0.1)
-                    pyautogui.click()
+                    self.window_manager.click_in_window(x, y, window_coords=False, duration=0.0)
+                elif not (PerformanceConfig.FAST_CLICKS and send_click(x, y)):
+                    # SendInput відхилено (UIPI / захищений робочий стіл) або вимкнено
+                    pyautogui.click(x, y)
                 
                 logging.info(f"✅ Полив виконано: {amount:.1f}л {fertilizer_text}")
                 
@@ -251,7 +285,7 @@ class SmartExecutor:
                 return False
                 
         except Exception as e:
-            logging.error(f"❌ Помилка поливу: {e}", exc_info=True)
+            logging.error(f"❌ Помилка поливу: {e}", exc_info=PerformanceConfig.LOG_TRACEBACKS)
             return False
     
     def _set_amount(self, amount: float):
@@ -259,22 +293,15 @@ class SmartExecutor:
         try:
             logging.debug(f"⚙️ Встановлення: {amount:.1f}л")
             
-            # Очищення поля (більше спроб для надійності)
-            for _ in range(8):
-                pyautogui.press("backspace")
-                time.sleep(0.03)
-            
-            time.sleep(0.1)
+            # Очищення поля (більше спроб для надійності) - один виклик замість циклу
+            pyautogui.press("backspace", presses=self.clear_presses, interval=0.0)
             
             # Введення значення
             amount_str = f"{amount:.1f}".replace(".", ",")  # Українська локаль
-            
-            for char in amount_str:
-                pyautogui.press(char)
-                time.sleep(self.typing_delay)
+            pyautogui.typewrite(amount_str, interval=self.typing_delay)
             
             logging.debug(f"   └─ Введено: {amount_str}л")
-            time.sleep(0.2)
+            time.sleep(0.15)
             
         except Exception as e:
             logging.error(f"❌ Помилка встановлення кількості: {e}")
@@ -320,7 +347,7 @@ class SmartExecutor:
             logging.warning("⚠️ Автопоповнення води ще не реалізовано")
             logging.info("💡 Поповніть воду вручну або реалізуйте логіку в _refill_water()")
             
-            self.stats['water_refills'] += 1
+            self.stats.water_refills += 1
             self.analyzer.game_context.add_action("Спроба поповнити воду")
             
         except Exception as e:
@@ -357,10 +384,11 @@ class SmartExecutor:
         logging.warning("🛑 АВАРІЙНА ЗУПИНКА")
         self.current_state = ExecutionState.ERROR
         
-        # Закриття всіх можливих меню
-        for _ in range(3):
-            pyautogui.press('esc')
-            time.sleep(0.2)
+        # Закриття всіх можливих меню: три ESC одним пакетом SendInput
+        if not send_key_presses(win32con.VK_ESCAPE, 3):
+            for _ in range(3):
+                pyautogui.press('esc')
+                time.sleep(0.2)
     
     def get_state_info(self) -> dict:
         """Інформація про поточний стан."""
@@ -369,20 +397,12 @@ class SmartExecutor:
             'watering_point_set': self.watering_point is not None,
             'watering_count': self.watering_count,
             'next_water_check': self.water_check_interval - (self.watering_count % self.water_check_interval),
-            'stats': self.stats,
+            'stats': asdict(self.stats),
         }
     
     def log_stats(self):
         """Логування статистики."""
-        state_info = self.get_state_info()
-        
-        logging.info("=" * 80)
-        logging.info("📊 СТАТИСТИКА ВИКОНАВЦЯ:")
-        logging.info(f"   🐛 Паразитів оброблено: {self.stats['parasites_treated']}")
-        logging.info(f"   💧 Поливів виконано: {self.stats['waterings_performed']}")
-        logging.info(f"   🚰 Поповнень води: {self.stats['water_refills']}")
-        logging.info(f"   ❌ Невдалих дій: {self.stats['failed_actions']}")
-        logging.info(f"   ✅ Всього дій: {self.stats['total_actions']}")
-        logging.info(f"   📍 Точка поливу: {'✅ Встановлена' if state_info['watering_point_set'] else '❌ Не встановлена'}")
-        logging.info(f"   🔄 Наступна перевірка води через: {state_info['next_water_check']} поливів")
-        logging.info("=" * 80)
\ No newline at end of file
+        remaining = self.water_check_interval - (self.watering_count % self.water_check_interval)
+        watering_point = '✅ Встановлена' if self.watering_point is not None else '❌ Не встановлена'
+        logging.info(_STATS_TEMPLATE.format(**asdict(self.stats), watering_point=watering_point,
+                                            remaining=remaining))
\ No newline at end of file
@@ -1,12 +1,14 @@
 """
 gui.py - Ігровий графічний інтерфейс
 """
+import re
 import time
-from datetime import datetime
+from collections import deque
 import tkinter as tk
 from tkinter import messagebox, ttk
 
-import pyautogui
+import win32api
+import win32con
 
 from bot import PlantCareBot
 from config import LOGS_DIR, SCREENSHOTS_DIR, CONFIG_FILE
@@ -30,62 +32,71 @@ class GamingGUI:
         'highlight': '#388bfd',
     }
     
+    # Теги логу за ключовими словами, у порядку пріоритету (новий тег - новий рядок таблиці).
+    # Регулярка і словник будуються з таблиці: один прохід без message.lower()
+    _LOG_TAG_RULES = (
+        ('success', ('✅', 'успішно')),
+        ('warning', ('⚠️', 'попередження')),
+        ('error', ('❌', 'помилка')),
+    )
+    _LOG_TAG_MAP = {keyword: tag for tag, keywords in _LOG_TAG_RULES for keyword in keywords}
+    _LOG_TAG_RE = re.compile('|'.join(map(re.escape, _LOG_TAG_MAP)), re.IGNORECASE)
+    _LOG_TAG_PRIORITY = tuple(tag for tag, _ in _LOG_TAG_RULES)
+    
     def __init__(self, bot: PlantCareBot):
         self.bot = bot
         self.root = tk.Tk()
+        self.root.withdraw()  # Вікно показується вже розкладеним (_create_ui)
         self.root.title("🌱 Plant Care Bot v2.0")
         self.root.geometry("900x700")
         self.root.configure(bg=self.COLORS['bg'])
         self.root.resizable(True, True)
         
+        # Черга логів і статистика з потоку бота виводяться одним оновленням раз на 50 мс
+        self._log_queue = deque(maxlen=2000)
+        self._stats_dirty = False
+        self._refresh_pending = False
+        self._log_lines = 0  # Рядків у вікні логу (без запиту index до Tcl)
+        self._ts_key = -1  # Секунда, для якої вже відформатовано мітку часу
+        self._ts_str = ""
+        
+        # Елементи статистики (заповнює _create_stats_card) і останні показані значення
+        self._stat_items = {}
+        self._last_stats = {}
+        
         self._setup_styles()
         self._create_ui()
         
         self.bot._log_callback = self.add_log
+        # Статистика оновлюється, коли бот її змінює, а не опитуванням щосекунди
+        self.bot._stats_callback = self._on_stats_changed
         self.is_animating = False
     
     def _setup_styles(self):
-        """Налаштування стилів."""
+        """Налаштування стилів (усі стилі - з однієї таблиці, одним проходом)."""
         style = ttk.Style()
         style.theme_use('clam')
         
-        # Кнопки
-        style.configure('Gaming.TButton',
-                       background=self.COLORS['accent'],
-                       foreground=self.COLORS['text'],
-                       borderwidth=0,
-                       focuscolor='none',
-                       padding=(25, 12),
-                       font=('Segoe UI', 10, 'bold'))
+        c = self.COLORS
+        styles = (
+            # Кнопки
+            ('Gaming.TButton', dict(background=c['accent'], foreground=c['text'], borderwidth=0,
+                                    focuscolor='none', padding=(25, 12), font=('Segoe UI', 10, 'bold'))),
+            # Фрейми
+            ('Dark.TFrame', dict(background=c['bg'])),
+            ('Card.TFrame', dict(background=c['card'])),
+            # Лейбли
+            ('Title.TLabel', dict(background=c['bg'], foreground=c['text'], font=('Segoe UI', 26, 'bold'))),
+            ('Subtitle.TLabel', dict(background=c['bg'], foreground=c['text_dim'], font=('Segoe UI', 11))),
+            ('Status.TLabel', dict(background=c['card'], foreground=c['success'], font=('Segoe UI', 16, 'bold'))),
+            ('Stats.TLabel', dict(background=c['card'], foreground=c['accent'], font=('Segoe UI', 12, 'bold'))),
+        )
+        for name, options in styles:
+            style.configure(name, **options)
         
         style.map('Gaming.TButton',
-                 background=[('active', self.COLORS['highlight']),
-                           ('pressed', self.COLORS['highlight'])])
-        
-        # Фрейми
-        style.configure('Dark.TFrame', background=self.COLORS['bg'])
-        style.configure('Card.TFrame', background=self.COLORS['card'])
-        
-        # Лейбли
-        style.configure('Title.TLabel',
-                       background=self.COLORS['bg'],
-                       foreground=self.COLORS['text'],
-                       font=('Segoe UI', 26, 'bold'))
-        
-        style.configure('Subtitle.TLabel',
-                       background=self.COLORS['bg'],
-                       foreground=self.COLORS['text_dim'],
-                       font=('Segoe UI', 11))
-        
-        style.configure('Status.TLabel',
-                       background=self.COLORS['card'],
-                       foreground=self.COLORS['success'],
-                       font=('Segoe UI', 16, 'bold'))
-        
-        style.configure('Stats.TLabel',
-                       background=self.COLORS['card'],
-                       foreground=self.COLORS['accent'],
-                       font=('Segoe UI', 12, 'bold'))
+                 background=[('active', c['highlight']),
+                           ('pressed', c['highlight'])])
     
     def _create_ui(self):
         """Створення інтерфейсу."""
@@ -122,6 +133,10 @@ class GamingGUI:
         # ============ FOOTER ============
         footer = self._create_footer(main_frame)
         footer.pack(fill=tk.X, pady=(15, 0))
+        
+        # Одне розкладання всіх віджетів, потім показ вікна - без проміжних перемальовувань
+        self.root.update_idletasks()
+        self.root.deiconify()
     
     def _create_header(self, parent) -> ttk.Frame:
         """Створення заголовку."""
@@ -155,9 +170,8 @@ class GamingGUI:
         status_frame = ttk.Frame(card, style='Card.TFrame')
         status_frame.pack(fill=tk.X, padx=15, pady=10)
         
-        self.status_var = tk.StringVar(value="⏹️ Зупинено")
         self.status_label = tk.Label(status_frame, 
-                                     textvariable=self.status_var,
+                                     text="⏹️ Зупинено",
                                      bg=self.COLORS['card'],
                                      fg=self.COLORS['text_dim'],
                                      font=('Segoe UI', 16, 'bold'))
@@ -169,9 +183,6 @@ class GamingGUI:
         """Створення карти статистики."""
         card = self._create_card(parent, "📈 Статистика")
         
-        stats_frame = ttk.Frame(card, style='Card.TFrame')
-        stats_frame.pack(fill=tk.X, padx=15, pady=10)
-        
         # 4 колонки статистики
         stats_data = [
             ("🔍", "Сканувань", "scans"),
@@ -180,32 +191,33 @@ class GamingGUI:
             ("💧", "Поливів", "waters"),
         ]
         
-        self.stat_vars = {}
-        for i, (icon, label, key) in enumerate(stats_data):
-            stat_frame = ttk.Frame(stats_frame, style='Card.TFrame')
-            stat_frame.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
-            
-            icon_label = tk.Label(stat_frame, text=icon, 
-                                bg=self.COLORS['card'],
-                                fg=self.COLORS['accent'],
-                                font=('Segoe UI', 20))
-            icon_label.pack()
-            
-            self.stat_vars[key] = tk.StringVar(value="0")
-            value_label = tk.Label(stat_frame, 
-                                  textvariable=self.stat_vars[key],
-                                  bg=self.COLORS['card'],
-                                  fg=self.COLORS['text'],
-                                  font=('Segoe UI', 16, 'bold'))
-            value_label.pack()
-            
-            text_label = tk.Label(stat_frame, text=label,
-                                bg=self.COLORS['card'],
-                                fg=self.COLORS['text_dim'],
-                                font=('Segoe UI', 9))
-            text_label.pack()
-        
-        # Автооновлення статистики
+        # Одне полотно з текстовими елементами замість 12 віджетів Label
+        canvas = tk.Canvas(card, height=90, bg=self.COLORS['card'], highlightthickness=0)
+        canvas.pack(fill=tk.X, padx=15, pady=10)
+        self._stat_canvas = canvas
+        
+        # (y, колір, шрифт) для рядків колонки: іконка, значення, підпис
+        rows = ((18, self.COLORS['accent'], ('Segoe UI', 20)),
+                (52, self.COLORS['text'], ('Segoe UI', 16, 'bold')),
+                (78, self.COLORS['text_dim'], ('Segoe UI', 9)))
+        columns = []
+        for icon, label, key in stats_data:
+            items = [canvas.create_text(0, y, text=text, fill=fill, font=font)
+                     for text, (y, fill, font) in zip((icon, "0", label), rows)]
+            self._stat_items[key] = items[1]
+            columns.append(items)
+        
+        def on_resize(event):
+            # Колонки однакової ширини по центру
+            column_width = event.width / len(columns)
+            for i, items in enumerate(columns):
+                x = column_width * (i + 0.5)
+                for item, (y, _, _) in zip(items, rows):
+                    canvas.coords(item, x, y)
+        
+        canvas.bind('<Configure>', on_resize)
+        
+        # Початкові значення (далі - _on_stats_changed)
         self._update_stats()
         
         return card
@@ -324,9 +336,11 @@ class GamingGUI:
                        activeforeground='white',
                        borderwidth=0)
         
-        # Hover ефект
+        # Hover ефект (світліший колір рахується один раз, а не на кожне наведення)
+        hover = self._lighten_color(color)
+        
         def on_enter(e):
-            btn['bg'] = self._lighten_color(color)
+            btn['bg'] = hover
         
         def on_leave(e):
             btn['bg'] = color
@@ -345,42 +359,89 @@ class GamingGUI:
         b = min(255, int(b * 1.2))
         return f'#{r:02x}{g:02x}{b:02x}'
     
+    def _on_stats_changed(self):
+        """Callback бота (з його потоку) - оновлення разом з наступним виводом логів."""
+        self._stats_dirty = True
+        self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        """Один таймер Tk на всі зміни за 50 мс; без змін - жодних таймерів."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.root.after(50, self._refresh)
+    
+    def _refresh(self):
+        """Оновлення GUI по накопичених змінах: статистика і логи."""
+        self._refresh_pending = False
+        if self._stats_dirty:
+            self._stats_dirty = False
+            self._update_stats()
+        self._flush_logs()
+    
     def _update_stats(self):
         """Оновлення статистики."""
-        if hasattr(self, 'stat_vars'):
-            for key, var in self.stat_vars.items():
-                var.set(str(self.bot.stats.get(key, 0)))
-        
-        self.root.after(1000, self._update_stats)
+        stats = self.bot.stats
+        for key, item in self._stat_items.items():
+            # Tk перемальовує елемент на кожну зміну - оновлюємо лише змінені
+            value = str(stats.get(key, 0))
+            if self._last_stats.get(key) != value:
+                self._stat_canvas.itemconfigure(item, text=value)
+                self._last_stats[key] = value
     
     def add_log(self, message: str):
         """Додавання логу з кольоровим форматуванням."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        full_message = f"[{timestamp}] {message}\n"
-        
-        # Визначення тегу
+        # Мітка часу форматується раз на секунду, а не на кожне повідомлення
+        key = int(time.time())
+        if key != self._ts_key:
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(key))
+            self._ts_key = key
+        full_message = f"[{self._ts_str}] {message}\n"
+        
+        # Визначення тегу (пріоритет: успіх > попередження > помилка)
         tag = 'info'
-        if '✅' in message or 'успішно' in message.lower():
-            tag = 'success'
-        elif '⚠️' in message or 'попередження' in message.lower():
-            tag = 'warning'
-        elif '❌' in message or 'помилка' in message.lower():
-            tag = 'error'
-        
-        self.log_text.insert(tk.END, full_message, tag)
-        self.log_text.see(tk.END)
-        
-        # Обмеження розміру логу
-        lines = int(self.log_text.index('end-1c').split('.')[0])
-        if lines > 500:
-            self.log_text.delete('1.0', '100.0')
+        found = {self._LOG_TAG_MAP[m.lower()] for m in self._LOG_TAG_RE.findall(message)}
+        if found:
+            tag = next(t for t in self._LOG_TAG_PRIORITY if t in found)
+        
+        self._log_queue.append((full_message, tag))
+        self._schedule_refresh()
+    
+    def _flush_logs(self):
+        """Вивід накопичених логів: одна вставка в Text на весь пакет."""
+        if not self._log_queue:
+            return
+        
+        # Сусідні повідомлення з однаковим тегом склеюються в один фрагмент
+        chunks = []
+        text_parts = []
+        current_tag = None
+        while self._log_queue:
+            message, tag = self._log_queue.popleft()
+            if tag != current_tag and text_parts:
+                chunks += ("".join(text_parts), current_tag)
+                text_parts = []
+            current_tag = tag
+            text_parts.append(message)
+        chunks += ("".join(text_parts), current_tag)
+        
+        # Автопрокрутка лише якщо користувач не прокрутив лог вгору
+        at_bottom = self.log_text.yview()[1] >= 0.99
+        self.log_text.insert(tk.END, *chunks)
+        if at_bottom:
+            self.log_text.see(tk.END)
+        self._log_lines += sum(text.count('\n') for text in chunks[::2])
+        
+        # Обмеження розміру логу: лишаються останні 400 рядків
+        if self._log_lines > 500:
+            excess = self._log_lines - 400
+            self.log_text.delete('1.0', f'{excess + 1}.0')
+            self._log_lines -= excess
     
     def start(self):
         """Запуск бота."""
         self.bot.start()
         if self.bot._running:
-            self.status_var.set("▶️ Працює")
-            self.status_label.config(fg=self.COLORS['success'])
+            self.status_label.config(text="▶️ Працює", fg=self.COLORS['success'])
             self.start_btn.config(state=tk.DISABLED)
             self.pause_btn.config(state=tk.NORMAL)
             self.stop_btn.config(state=tk.NORMAL)
@@ -389,24 +450,21 @@ class GamingGUI:
     def pause(self):
         """Пауза."""
         self.bot.pause()
-        self.status_var.set("⏸️ Пауза")
-        self.status_label.config(fg=self.COLORS['warning'])
+        self.status_label.config(text="⏸️ Пауза", fg=self.COLORS['warning'])
         self.pause_btn.config(state=tk.DISABLED)
         self.resume_btn.config(state=tk.NORMAL)
     
     def resume(self):
         """Продовження."""
         self.bot.resume()
-        self.status_var.set("▶️ Працює")
-        self.status_label.config(fg=self.COLORS['success'])
+        self.status_label.config(text="▶️ Працює", fg=self.COLORS['success'])
         self.pause_btn.config(state=tk.NORMAL)
         self.resume_btn.config(state=tk.DISABLED)
     
     def stop(self):
         """Зупинка."""
         self.bot.stop()
-        self.status_var.set("⏹️ Зупинено")
-        self.status_label.config(fg=self.COLORS['text_dim'])
+        self.status_label.config(text="⏹️ Зупинено", fg=self.COLORS['text_dim'])
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
         self.resume_btn.config(state=tk.DISABLED)
@@ -440,24 +498,31 @@ class GamingGUI:
         
         result = messagebox.askokcancel("Область аналізу", msg)
         if result:
-            time.sleep(2)
-            x1, y1 = pyautogui.position()
-            self.add_log(f"📍 Верхній лівий кут: ({x1}, {y1})")
-            
-            time.sleep(2)
-            x2, y2 = pyautogui.position()
-            self.add_log(f"📍 Нижній правий кут: ({x2}, {y2})")
-            
-            self.bot.set_analysis_region(x1, y1, x2, y2)
-            messagebox.showinfo("Готово", 
-                              f"✅ Область встановлено:\n({x1}, {y1}) -> ({x2}, {y2})\nРозмір: {x2-x1}x{y2-y1}px")
+            # Кути знімаються через root.after - GUI не зависає на час очікування
+            self.root.after(2000, self._region_capture_first)
         else:
             # Використовуємо автоматичну нижню половину
             self.bot.analyzer.auto_detect_bottom_half()
-            screen_w, screen_h = pyautogui.size()
+            screen_w = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
+            screen_h = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
             messagebox.showinfo("Автоматично", 
                               f"✅ Використовується нижня 50% екрану:\nРозмір: {screen_w}x{screen_h//2}px")
     
+    def _region_capture_first(self):
+        """Крок 1: верхній лівий кут області."""
+        x1, y1 = win32api.GetCursorPos()
+        self.add_log(f"📍 Верхній лівий кут: ({x1}, {y1})")
+        self.root.after(2000, self._region_capture_second, x1, y1)
+    
+    def _region_capture_second(self, x1: int, y1: int):
+        """Крок 2: нижній правий кут і встановлення області."""
+        x2, y2 = win32api.GetCursorPos()
+        self.add_log(f"📍 Нижній правий кут: ({x2}, {y2})")
+        
+        self.bot.set_analysis_region(x1, y1, x2, y2)
+        messagebox.showinfo("Готово", 
+                          f"✅ Область встановлено:\n({x1}, {y1}) -> ({x2}, {y2})\nРозмір: {x2-x1}x{y2-y1}px")
+    
     def on_exit(self):
         """Обробка виходу."""
         if self.bot._running:
@@ -465,6 +530,7 @@ class GamingGUI:
                 self.bot.stop()
                 self.root.destroy()
         else:
+            self.bot.stop()  # Після зупинки через помилки ще треба звільнити пули та Tesseract
             self.root.destroy()
     
     def run(self):
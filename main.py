@@ -1,14 +1,22 @@
 """
 main.py - Plant Care Bot v2.1 ENHANCED - Головний файл запуску
 """
+import os
 import sys
 import logging
 from pathlib import Path
-from tkinter import messagebox
 
+# Важкі модулі (OpenCV, tkinter, pyautogui через bot/gui) імпортуються лише
+# після успішної перевірки системи - помилка показується без їх завантаження
 from config import TESSERACT_PATH, setup_enhanced_logging
-from bot import PlantCareBot
-from gui import GamingGUI
+
+
+def _show_error(title: str, message: str):
+    """Вікно з помилкою (tkinter імпортується лише тут)."""
+    if 'pytest' in sys.modules:  # Не показувати messagebox в тестах
+        return
+    from tkinter import messagebox
+    messagebox.showerror(title, message)
 
 
 # ======================== ПЕРЕВІРКА СИСТЕМИ ========================
@@ -17,7 +25,7 @@ def check_system_requirements() -> bool:
     errors = []
     
     # Перевірка Tesseract
-    if not Path(TESSERACT_PATH).exists():
+    if not os.path.isfile(TESSERACT_PATH):
         errors.append(
             f"❌ Tesseract OCR не знайдено:\n{TESSERACT_PATH}\n\n"
             "Завантажте з: https://github.com/UB-Mannheim/tesseract/wiki"
@@ -30,28 +38,21 @@ def check_system_requirements() -> bool:
         logging.warning("⚠️ Створено папку 'data' для шаблонів")
         logging.info("💡 Додайте файли: chemicals.png, full_leyka.png, empty_leyka.png")
     
-    # Перевірка OpenCV CUDA (опціонально)
-    try:
-        import cv2
-        cuda_available = cv2.cuda.getCudaEnabledDeviceCount() > 0
-        if cuda_available:
-            logging.info("✅ OpenCV CUDA доступний - GPU прискорення активне!")
-        else:
-            logging.warning("⚠️ OpenCV CUDA недоступний - використовується CPU")
-            logging.info("💡 Для GPU прискорення встановіть: pip install opencv-contrib-python")
-    except Exception as e:
-        logging.debug(f"CUDA перевірка: {e}")
-    
     # Якщо є помилки - виводимо
     if errors:
         error_msg = "\n\n".join(errors)
         logging.error(error_msg)
-        
-        if 'pytest' not in sys.modules:  # Не показувати messagebox в тестах
-            messagebox.showerror("Помилка системи", error_msg)
-        
+        _show_error("Помилка системи", error_msg)
         return False
     
+    # Перевірка OpenCV CUDA (опціонально; результат кешується і для PerformanceOptimizer)
+    from performance_optimizer import cuda_device_count
+    if cuda_device_count() > 0:
+        logging.info("✅ OpenCV CUDA доступний - GPU прискорення активне!")
+    else:
+        logging.warning("⚠️ OpenCV CUDA недоступний - використовується CPU")
+        logging.info("💡 Для GPU прискорення встановіть: pip install opencv-contrib-python")
+    
     return True
 
 
@@ -76,6 +77,9 @@ def main():
         
         logging.info("✅ Системні вимоги виконані")
         
+        from bot import PlantCareBot
+        from gui import GamingGUI
+        
         # Створення бота
         logging.info("🔧 Ініціалізація Plant Care Bot...")
         bot = PlantCareBot()
@@ -107,16 +111,13 @@ def main():
     except Exception as e:
         error_msg = f"❌ Критична помилка: {e}"
         logging.error(error_msg, exc_info=True)
-        
-        if 'pytest' not in sys.modules:
-            messagebox.showerror("Критична помилка", error_msg)
-        
+        _show_error("Критична помилка", error_msg)
         return 1
         
     finally:
         # Очищення ресурсів
         try:
-            if 'bot' in locals() and bot._running:
+            if 'bot' in locals():
                 logging.info("🛑 Зупинка бота...")
                 bot.stop()
         except Exception as e:
@@ -3,34 +3,57 @@ performance_optimizer.py - ВИПРАВЛЕНА ВЕРСІЯ
 Фікси:
 1. Видалено подвійне масштабування
 2. М'якша обробка для OCR
-3. PNG для скріншотів замість JPEG
+3. Формат скріншотів - PerformanceConfig.SCREENSHOT_FORMAT
 """
 import logging
 import time
+import functools
 from typing import Optional, Tuple
 from pathlib import Path
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 import hashlib
 
 import cv2
 import numpy as np
-from PIL import Image
 import psutil
 
 from config import PerformanceConfig
 
 
+@functools.lru_cache(maxsize=1)
+def cuda_device_count() -> int:
+    """Кількість CUDA-пристроїв OpenCV (перевірка ініціалізує драйвер - виконується один раз)."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount()
+    except Exception as e:
+        logging.debug(f"CUDA перевірка: {e}")
+        return 0
+
+
 class PerformanceOptimizer:
     """Оптимізатор з ВИПРАВЛЕННЯМИ для якісних скріншотів."""
     
     def __init__(self):
         self.config = PerformanceConfig()
         self.gpu_available = self._check_and_init_gpu()
+        self.use_opencl = self._check_and_init_opencl()
+        
+        # Підготовка кадру для OCR на GPU - лише якщо ввімкнено в конфігу
+        self.ocr_on_gpu = self.gpu_available and self.config.OCR_ON_GPU
+        
+        # Постійний кадр у пам'яті GPU для OCR (без виділення на кожен кадр)
+        self._gpu_frame = cv2.cuda_GpuMat() if self.ocr_on_gpu else None
+        
         self.thread_pool = ThreadPoolExecutor(max_workers=self.config.CPU_THREADS)
         
-        # Кеш для OCR результатів
-        self.ocr_cache = {}
-        self.cache_timestamps = {}
+        # Буфери проміжних зображень OCR (перевиділяються лише при зміні розміру)
+        self._ocr_buffers = {}
+        self._clahe_light = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        self._clahe_standard = cv2.createCLAHE(clipLimit=2.5, tileGridSize=(8, 8))
+        
+        # Кеш OCR: хеш кадру -> (текст, час запису), порядок - від найстарішого
+        self.ocr_cache = OrderedDict()
         
         # Буфер для скріншотів
         self.screenshot_buffer = []
@@ -56,7 +79,7 @@ class PerformanceOptimizer:
             return False
         
         try:
-            cuda_devices = cv2.cuda.getCudaEnabledDeviceCount()
+            cuda_devices = cuda_device_count()
             
             if cuda_devices > 0:
                 cv2.cuda.setDevice(0)
@@ -76,6 +99,24 @@ class PerformanceOptimizer:
             logging.error(f"❌ Помилка ініціалізації GPU: {e}")
             return False
     
+    def _check_and_init_opencl(self) -> bool:
+        """OpenCL (T-API) для обробки перед OCR - лише без CUDA і якщо ввімкнено в конфігу."""
+        if not self.config.USE_OPENCL or self.gpu_available:
+            return False
+        
+        try:
+            if not cv2.ocl.haveOpenCL():
+                logging.info("💻 OpenCL недоступний, обробка для OCR на CPU")
+                return False
+            
+            cv2.ocl.setUseOpenCL(True)
+            logging.info(f"🎮 OpenCL активовано: {cv2.ocl.Device.getDefault().name()}")
+            return cv2.ocl.useOpenCL()
+        
+        except Exception as e:
+            logging.error(f"❌ Помилка ініціалізації OpenCL: {e}")
+            return False
+    
     def _log_system_info(self):
         """Системна інформація."""
         try:
@@ -101,6 +142,8 @@ class PerformanceOptimizer:
         Args:
             image: Вхідне зображення
             for_ocr: True якщо для OCR (НЕ масштабувати!), False для збереження
+        
+        Для OCR повертається той самий масив без копії - викликач не повинен його змінювати.
         """
         start_time = time.time()
         original_size = image.shape[:2]
@@ -109,7 +152,7 @@ class PerformanceOptimizer:
             # ✅ ДЛЯ OCR - ЗАЛИШАЄМО ОРИГІНАЛЬНИЙ РОЗМІР
             if for_ocr:
                 logging.debug(f"📸 OCR mode: зберігаємо оригінал {original_size[1]}x{original_size[0]}")
-                return image.copy()
+                return image
             
             # ✅ ДЛЯ ЗБЕРЕЖЕННЯ - масштабуємо лише якщо потрібно
             if self.config.SCREENSHOT_SCALE != 1.0:
@@ -146,31 +189,52 @@ class PerformanceOptimizer:
             logging.error(f"❌ Помилка оптимізації: {e}")
             return image
     
+    def upload_frame(self, image: np.ndarray) -> "cv2.cuda_GpuMat":
+        """Завантаження вже захопленого кадру в пам'ять GPU (один постійний GpuMat,
+        перевиділяється лише при зміні розміру).
+        
+        Лише для потоку аналізу - фонове збереження використовує власні GpuMat.
+        """
+        self._gpu_frame.upload(image)
+        return self._gpu_frame
+    
+    def gray_for_ocr_gpu(self, gpu_frame: "cv2.cuda_GpuMat", max_width: int) -> np.ndarray:
+        """Сірий кадр для OCR, зменшений на GPU - на CPU завантажується лише результат."""
+        gray = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGR2GRAY)
+        
+        w, h = gray.size()
+        scale = min(1.0, max_width / w)
+        if scale < 1.0:
+            gray = cv2.cuda.resize(gray, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+        
+        self.stats['gpu_operations'] += 1
+        return gray.download()
+    
     def save_screenshot_optimized(self, image: np.ndarray, path: Path) -> bool:
         """
-        🔧 ВИПРАВЛЕНО: PNG замість JPEG, без подвійного масштабування
+        Збереження скріншоту у форматі SCREENSHOT_FORMAT (JPEG або PNG).
+        
+        Кодування через cv2.imencode (libjpeg-turbo/libpng, відпускає GIL)
+        прямо з BGR, без конвертації в RGB та PIL.
         """
         try:
             # ✅ ОДНОКРАТНЕ масштабування для збереження
             optimized = self.optimize_screenshot(image, for_ocr=False)
             
-            # Конвертація BGR → RGB
-            image_rgb = cv2.cvtColor(optimized, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(image_rgb)
+            if self.config.SCREENSHOT_FORMAT.upper() == 'PNG':
+                ok, encoded = cv2.imencode('.png', optimized,
+                                           [cv2.IMWRITE_PNG_COMPRESSION, self.config.PNG_COMPRESSION_LEVEL])
+            else:
+                ok, encoded = cv2.imencode('.jpg', optimized, [cv2.IMWRITE_JPEG_QUALITY, self.config.SCREENSHOT_QUALITY])
+            if not ok:
+                raise ValueError("cv2.imencode повернув помилку")
             
-            # ✅ PNG замість JPEG - без артефактів компресії
-            # Для економії місця - PNG з compression=6 (баланс)
-            pil_image.save(
-                path,
-                format='PNG',
-                compress_level=6,  # 0-9, 6 = баланс швидкість/розмір
-                optimize=True
-            )
+            path.write_bytes(encoded.tobytes())
             
-            file_size_kb = path.stat().st_size / 1024
+            file_size_kb = encoded.size / 1024
             self.stats['screenshots_saved'] += 1
             
-            logging.debug(f"💾 Збережено: {path.name} ({file_size_kb:.0f} KB, PNG)")
+            logging.debug(f"💾 Збережено: {path.name} ({file_size_kb:.0f} KB, {self.config.SCREENSHOT_FORMAT})")
             
             return True
             
@@ -187,84 +251,121 @@ class PerformanceOptimizer:
         """
         mode = mode or self.config.OCR_PREPROCESSING
         
+        size = image.shape[:2]
+        
+        # OpenCL: увесь конвеєр на UMat, на CPU повертається лише результат.
+        # Проміжні UMat живуть на пристрої - постійні numpy-буфери не потрібні
+        if self.use_opencl:
+            src = cv2.UMat(image)
+            buffer = lambda name, shape: None
+        else:
+            src = image
+            buffer = self._ocr_buffer
+        
         try:
-            # Конвертація в сірий
+            # Конвертація в сірий (у постійний буфер - без виділення пам'яті на кадр)
             if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst=buffer('gray', size))
             else:
-                gray = image
+                gray = src
             
             # ✅ LIGHT MODE (рекомендовано для більшості випадків)
             if mode == 'light':
                 # Просто CLAHE + Otsu - найкраща якість для чіткого тексту
-                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-                enhanced = clahe.apply(gray)
-                _, processed = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+                enhanced = self._clahe_light.apply(gray, dst=buffer('enhanced', size))
+                _, processed = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+                                             dst=buffer('binary', size))
                 logging.debug("📝 OCR preprocessing: LIGHT (CLAHE + Otsu)")
             
             # ✅ STANDARD MODE
             elif mode == 'standard':
-                # Легкий денойзинг + CLAHE + Otsu
-                denoised = cv2.fastNlMeansDenoising(gray, h=5)  # h=5 замість 10
-                clahe = cv2.createCLAHE(clipLimit=2.5, tileGridSize=(8, 8))
-                enhanced = clahe.apply(denoised)
-                _, processed = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+                # Легкий денойзинг + CLAHE + Otsu. Bilateral зберігає краї тексту
+                # не гірше за NLM, але в рази швидший
+                if self.config.OCR_DENOISE == 'nlm':
+                    denoised = cv2.fastNlMeansDenoising(gray, dst=buffer('denoised', size),
+                                                        h=5)  # h=5 замість 10
+                else:
+                    denoised = cv2.bilateralFilter(gray, 5, 25, 25,
+                                                   dst=buffer('denoised', size))
+                enhanced = self._clahe_standard.apply(denoised, dst=buffer('enhanced', size))
+                _, processed = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+                                             dst=buffer('binary', size))
                 logging.debug("📝 OCR preprocessing: STANDARD")
             
             # ⚠️ AGGRESSIVE MODE (тільки для дуже поганих зображень)
             else:
-                # Повна обробка
-                denoised = cv2.fastNlMeansDenoising(gray, h=7)
+                # Повна обробка. Вікна NLM 5/11 замість 7/21 - у ~9 разів менше роботи
+                denoised = cv2.fastNlMeansDenoising(gray, dst=buffer('denoised', size), h=7,
+                                                    templateWindowSize=5, searchWindowSize=11)
                 
-                # Adaptive threshold замість CLAHE (краще для нерівного освітлення)
+                # Adaptive threshold замість CLAHE (краще для нерівного освітлення).
+                # Морфологічне закриття ядром 1x1 нічого не змінює - не виконується
                 processed = cv2.adaptiveThreshold(
                     denoised, 255,
                     cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                    cv2.THRESH_BINARY, 11, 2
+                    cv2.THRESH_BINARY, 11, 2,
+                    dst=buffer('binary', size)
                 )
-                
-                # М'яка морфологія
-                kernel = np.ones((1, 1), np.uint8)  # 1x1 замість 2x2
-                processed = cv2.morphologyEx(processed, cv2.MORPH_CLOSE, kernel)
                 logging.debug("📝 OCR preprocessing: AGGRESSIVE")
             
-            return processed
+            return processed.get() if self.use_opencl else processed
             
         except Exception as e:
             logging.error(f"❌ Помилка обробки для OCR: {e}")
             return image
     
-    def cache_ocr_result(self, image_hash: str, result: str):
-        """Кешування OCR."""
+    def _ocr_buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Буфер під проміжне зображення OCR; результат дійсний до наступного кадру."""
+        buffer = self._ocr_buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._ocr_buffers[name] = buffer
+        return buffer
+    
+    def compute_image_hash(self, image: np.ndarray) -> int:
+        """64-бітний хеш вмісту всього кадру (через мініатюру 32x32)."""
+        # Мініатюра одразу в постійний суцільний буфер - tobytes() без проміжних копій
+        thumb = cv2.resize(image, (32, 32), dst=self._ocr_buffer('hash', (32, 32) + image.shape[2:]),
+                           interpolation=cv2.INTER_AREA)
+        digest = hashlib.blake2b(thumb.tobytes(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+    
+    def cache_ocr_result(self, image_hash: int, result: str):
+        """Кешування OCR (не більше OCR_CACHE_MAX_ENTRIES кадрів, найстаріші витісняються)."""
         if not self.config.OCR_CACHE_ENABLED:
             return
         
-        self.ocr_cache[image_hash] = result
-        self.cache_timestamps[image_hash] = time.time()
+        self.ocr_cache[image_hash] = (result, time.monotonic())
+        self.ocr_cache.move_to_end(image_hash)
+        
+        # Витіснення з початку: прострочені та зайві записи, без перебору всього кешу
+        cutoff = time.monotonic() - self.config.OCR_CACHE_TTL
+        while self.ocr_cache:
+            _, oldest_time = next(iter(self.ocr_cache.values()))
+            if len(self.ocr_cache) <= self.config.OCR_CACHE_MAX_ENTRIES and oldest_time >= cutoff:
+                break
+            self.ocr_cache.popitem(last=False)
     
-    def get_cached_ocr(self, image: np.ndarray) -> Optional[str]:
-        """Отримання кешованого OCR."""
+    def get_cached_ocr(self, image_hash: int) -> Optional[str]:
+        """Отримання кешованого OCR за хешем з compute_image_hash()."""
         if not self.config.OCR_CACHE_ENABLED:
             return None
         
-        # Хеш зображення (тільки перші 100 пікселів для швидкості)
-        sample = image[:10, :10].flatten()
-        image_hash = hashlib.md5(sample.tobytes()).hexdigest()[:16]
-        
-        if image_hash not in self.ocr_cache:
+        entry = self.ocr_cache.get(image_hash)
+        if entry is None:
             self.stats['cache_misses'] += 1
             return None
         
         # Перевірка TTL
-        if time.time() - self.cache_timestamps[image_hash] > self.config.OCR_CACHE_TTL:
+        result, stored_at = entry
+        if time.monotonic() - stored_at > self.config.OCR_CACHE_TTL:
             del self.ocr_cache[image_hash]
-            del self.cache_timestamps[image_hash]
             self.stats['cache_misses'] += 1
             return None
         
         self.stats['cache_hits'] += 1
         logging.debug(f"💾 Cache HIT")
-        return self.ocr_cache[image_hash]
+        return result
     
     def parallel_ocr(self, images: list, ocr_func, *args, **kwargs) -> list:
         """Паралельний OCR."""
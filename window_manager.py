@@ -22,6 +22,90 @@ import psutil
 import pyautogui
 from PIL import ImageGrab
 import ctypes
+from ctypes import wintypes
+
+from config import PerformanceConfig
+
+
+# ============ ШВИДКИЙ ВВІД (SendInput) ============
+_MOUSEEVENTF_MOVE = 0x0001
+_MOUSEEVENTF_LEFTDOWN = 0x0002
+_MOUSEEVENTF_LEFTUP = 0x0004
+_MOUSEEVENTF_VIRTUALDESK = 0x4000
+_MOUSEEVENTF_ABSOLUTE = 0x8000
+_KEYEVENTF_KEYUP = 0x0002
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', wintypes.WORD),
+        ('wScan', wintypes.WORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('mi', _MOUSEINPUT), ('ki', _KEYBDINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [('type', wintypes.DWORD), ('u', _INPUTUNION)]
+
+
+def _mouse_input(dx: int, dy: int, flags: int) -> _INPUT:
+    return _INPUT(_INPUT_MOUSE, _INPUTUNION(mi=_MOUSEINPUT(dx, dy, 0, flags, 0, 0)))
+
+
+def _key_input(vk: int, flags: int) -> _INPUT:
+    return _INPUT(_INPUT_KEYBOARD, _INPUTUNION(ki=_KEYBDINPUT(vk, 0, flags, 0, 0)))
+
+
+def _send_inputs(*events: _INPUT) -> bool:
+    """Усі події - одним викликом SendInput; True, якщо система прийняла всі."""
+    inputs = (_INPUT * len(events))(*events)
+    return ctypes.windll.user32.SendInput(len(events), inputs, ctypes.sizeof(_INPUT)) == len(events)
+
+
+def send_click(x: int, y: int) -> bool:
+    """Переміщення + натискання + відпускання лівої кнопки одним викликом SendInput."""
+    # Абсолютні координати нормалізуються до 0..65535 по всьому віртуальному робочому столу
+    left = win32api.GetSystemMetrics(win32con.SM_XVIRTUALSCREEN)
+    top = win32api.GetSystemMetrics(win32con.SM_YVIRTUALSCREEN)
+    width = max(win32api.GetSystemMetrics(win32con.SM_CXVIRTUALSCREEN) - 1, 1)
+    height = max(win32api.GetSystemMetrics(win32con.SM_CYVIRTUALSCREEN) - 1, 1)
+    dx = (x - left) * 65535 // width
+    dy = (y - top) * 65535 // height
+    
+    move_flags = _MOUSEEVENTF_MOVE | _MOUSEEVENTF_ABSOLUTE | _MOUSEEVENTF_VIRTUALDESK
+    return _send_inputs(
+        _mouse_input(dx, dy, move_flags),
+        _mouse_input(0, 0, _MOUSEEVENTF_LEFTDOWN),
+        _mouse_input(0, 0, _MOUSEEVENTF_LEFTUP),
+    )
+
+
+def send_key_presses(vk: int, count: int = 1) -> bool:
+    """count натискань клавіші (down+up) одним викликом SendInput."""
+    events = []
+    for _ in range(count):
+        events.append(_key_input(vk, 0))
+        events.append(_key_input(vk, _KEYEVENTF_KEYUP))
+    return _send_inputs(*events)
 
 
 @dataclass
@@ -592,10 +676,11 @@ class WindowManager:
                         f"[{left},{top},{right},{bottom}]"
                     )
             
-            # Клік
-            pyautogui.moveTo(screen_x, screen_y, duration=duration)
-            time.sleep(0.1)
-            pyautogui.click()
+            # Клік (якщо SendInput відхилено - UIPI / захищений робочий стіл - через pyautogui)
+            if not (PerformanceConfig.FAST_CLICKS and send_click(screen_x, screen_y)):
+                pyautogui.moveTo(screen_x, screen_y, duration=duration)
+                time.sleep(0.1)
+                pyautogui.click()
             
             self.stats['clicks_performed'] += 1
             